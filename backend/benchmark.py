@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+TextTale Benchmark Script
+Performance checks for the backend services and a running API server
+"""
+
+import sys
+import time
+import uuid
+import argparse
+import concurrent.futures
+from pathlib import Path
+
+import requests
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+
+def _timed_request(session: requests.Session, url: str, payload: dict) -> float:
+    """Send one story request and return its latency in seconds"""
+    start = time.perf_counter()
+    response = session.post(url, json=payload, timeout=600)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def run_load_test(base_url: str, concurrency_levels, requests_per_level: int, length: str):
+    """
+    Load test /api/generate-story at increasing concurrency
+
+    Throughput should grow with concurrency while the event loop stays free;
+    a server that blocks on generation shows flat throughput instead.
+    Every request has a unique prompt (run nonce, level and index), so the
+    story, narrative and TTS caches never answer for the generator.
+    """
+    url = f"{base_url}/api/generate-story"
+    payload = {"text": "A lighthouse keeper finds a map", "style": "adventure", "length": length}
+    run_id = uuid.uuid4().hex[:8]
+
+    print(f"Load testing {url} ({requests_per_level} requests per level)")
+    print(f"{'concurrency':>12} {'req/s':>8} {'p50 (s)':>9} {'p95 (s)':>9} {'options p50 (s)':>16}")
+
+    for concurrency in concurrency_levels:
+        session = requests.Session()
+        latencies = []
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(_timed_request, session, url, dict(payload, text=f"{payload['text']} {run_id}-{concurrency}-{i}"))
+                for i in range(requests_per_level)
+            ]
+
+            # Probe a cheap endpoint while stories are generating
+            probe_latencies = []
+            while not all(f.done() for f in futures):
+                probe_start = time.perf_counter()
+                requests.get(f"{base_url}/api/story-options", timeout=60)
+                probe_latencies.append(time.perf_counter() - probe_start)
+                time.sleep(0.1)
+
+            for future in futures:
+                latencies.append(future.result())
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        probe_latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        probe_p50 = probe_latencies[len(probe_latencies) // 2] if probe_latencies else 0.0
+        print(f"{concurrency:>12} {requests_per_level / elapsed:>8.2f} {p50:>9.2f} {p95:>9.2f} {probe_p50:>16.3f}")
+
+
+def run_tts_client_benchmark(calls: int, workers: int):
+    """
+    Compare pooled keep-alive TTS sessions with a fresh session per request
+
+    Runs against the local stub server so only connection handling differs.
+    """
+    from gtts import gTTS
+    from services.tts_client import TTSClient
+    from tts_stub_server import start_stub_server
+
+    server = start_stub_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    text = "The lighthouse keeper unrolled the map. " * 6  # several gTTS parts
+
+    print(f"TTS client benchmark: {calls} syntheses, {workers} workers, stub at {base_url}")
+    print(f"{'mode':>10} {'calls/s':>9} {'parts':>7}")
+
+    for mode, reuse in (("fresh", False), ("pooled", True)):
+        client = TTSClient(pool_size=workers, base_url=base_url, reuse_sessions=reuse)
+        parts = len(gTTS(text=text).get_bodies())
+
+        def synthesize(_):
+            return sum(len(segment) for segment in client.stream(gTTS(text=text)))
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(synthesize, range(calls)))
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>10} {calls / elapsed:>9.1f} {parts:>7}")
+
+    server.shutdown()
+
+
+def run_memory_benchmark(engine: str):
+    """
+    Peak Python memory of full-story audio generation for each story length
+
+    Audio is streamed to disk, so peak memory should stay flat while the file
+    grows; the old BytesIO path held about twice the file size.
+    """
+    import os
+    import tracemalloc
+    from services.tts_client import tts_client
+    from services.tts_engines import build_voice_configs
+    from services import story_service, narrative_service, audio_service
+    from tts_stub_server import start_stub_server
+
+    server = None
+    if engine == "gtts":
+        server = start_stub_server()
+        tts_client.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    audio_service.voice_configs = build_voice_configs(engine)
+    os.makedirs("static/audio", exist_ok=True)
+    story_service.generate_full_story_audio("Warm up the engine and connection.")
+
+    print(f"Memory benchmark ({engine} engine)")
+    print(f"{'length':>8} {'chars':>7} {'file (KB)':>10} {'peak (KB)':>10} {'BytesIO est. (KB)':>18}")
+
+    for length in narrative_service.get_available_lengths():
+        scenes = narrative_service.generate_structured_narrative(f"A {length} benchmark tale", "fantasy", length)
+        story_text = " ".join(scene["text"] for scene in scenes)
+
+        tracemalloc.start()
+        audio_url = story_service.generate_full_story_audio(story_text)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if not audio_url:
+            print(f"{length:>8} synthesis failed")
+            continue
+        file_size = os.path.getsize(audio_url.lstrip("/"))
+        print(f"{length:>8} {len(story_text):>7} {file_size / 1024:>10.1f} {peak / 1024:>10.1f} {2 * file_size / 1024:>18.1f}")
+
+    if server:
+        server.shutdown()
+
+
+def run_storage_stress_test(stories: int, concurrency: int, prompts: int):
+    """
+    Generate many stories in parallel and verify the audio file layout
+
+    Checks that no two scene texts share a file, every returned URL exists,
+    no temporary files are left behind, and shard directories stay small.
+    """
+    import io
+    import os
+    from collections import defaultdict
+    from services.tts_engines import build_voice_configs
+    from services import story_service, audio_service
+    from utils.audio_storage import AUDIO_ROOT
+
+    audio_service.voice_configs = build_voice_configs("formant")
+    styles = story_service.get_available_styles()
+    lengths = story_service.get_available_lengths()
+
+    def build(i: int):
+        return story_service.generate_story(
+            prompt=f"Stress tale {i % prompts}",
+            style=styles[i % len(styles)],
+            length=lengths[i % len(lengths)]
+        )
+
+    print(f"Storage stress test: {stories} stories, {concurrency} in parallel, {prompts} distinct prompts")
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(build, range(stories)))
+    elapsed = time.perf_counter() - start
+
+    texts_by_url = defaultdict(set)
+    missing_files = 0
+    for result in results:
+        for scene in result["story"]:
+            if not scene["audioUrl"]:
+                continue
+            texts_by_url[scene["audioUrl"]].add(scene["text"])
+            if not os.path.exists(scene["audioUrl"].lstrip("/")):
+                missing_files += 1
+
+    collisions = sum(1 for texts in texts_by_url.values() if len(texts) > 1)
+    temp_files = 0
+    largest_directory = 0
+    for directory, _, files in os.walk(AUDIO_ROOT):
+        temp_files += sum(1 for name in files if name.endswith(".tmp"))
+        largest_directory = max(largest_directory, len(files))
+
+    # Content check: a sample of files must match a fresh synthesis of their text
+    mismatches = 0
+    for url, texts in list(texts_by_url.items())[:50]:
+        expected = io.BytesIO()
+        audio_service._synthesize(next(iter(texts)), audio_service.voice_configs["woman"], expected)
+        with open(url.lstrip("/"), "rb") as f:
+            mismatches += f.read() != expected.getvalue()
+
+    scenes = sum(len(result["story"]) for result in results)
+    print(f"Generated {scenes} scenes ({len(texts_by_url)} distinct files) in {elapsed:.2f}s")
+    print(f"Collisions: {collisions}  Missing files: {missing_files}  Content mismatches: {mismatches}")
+    print(f"Leftover temp files: {temp_files}  Largest directory: {largest_directory} files")
+    if collisions or missing_files or mismatches or temp_files:
+        sys.exit(1)
+    print("OK")
+
+
+def run_tracking_benchmark(files: int, untracked: int, threads: int):
+    """
+    Track generated files from many threads, then clean them up
+
+    Cleanup cost should follow the number of tracked files and not change
+    when the audio directory also holds many untracked files.
+    """
+    import os
+    import shutil
+    import tempfile
+    import contextlib
+    from utils.cleanup import AudioCleanup
+    from utils.audio_storage import audio_file_path
+
+    root = tempfile.mkdtemp(prefix="texttale-tracking-")
+    try:
+        print(f"Creating {files} tracked and {untracked} untracked files in {root}...")
+        paths = []
+        for i in range(files + untracked):
+            path = audio_file_path("speech_bench", f"{i:064x}"[::-1], "mp3", root=root)
+            with open(path, "wb"):
+                pass
+            paths.append(path)
+        tracked_paths = paths[:files]
+
+        manager = AudioCleanup(root)
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            start = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(manager.track_generated_file, tracked_paths, chunksize=1000))
+            track_elapsed = time.perf_counter() - start
+            indexed = manager.tracked_count()
+
+            start = time.perf_counter()
+            for path in tracked_paths[::2]:
+                manager.protect_file(path)
+            manager.cleanup_generated_files()
+            partial_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            manager.cleanup_generated_files(include_protected=True)
+            full_elapsed = time.perf_counter() - start
+
+        remaining = sum(len(names) for _, _, names in os.walk(root))
+        print(f"Tracked {files} files from {threads} threads in {track_elapsed:.2f}s "
+              f"({files / track_elapsed:,.0f} files/s), {indexed} indexed")
+        print(f"Manual cleanup (half protected): {partial_elapsed:.2f}s")
+        print(f"Exit cleanup (remaining half): {full_elapsed:.2f}s")
+        print(f"Untracked files left untouched: {remaining} (expected {untracked})")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run_narrative_benchmark(iterations: int):
+    """
+    Microbenchmark of narrative generation for each story length
+
+    Scene templates are resolved per length at startup, so formatting a
+    story (a cache miss, timed through _format_scenes) only formats the
+    templates of the scenes it returns. Repeated prompts are served by the
+    narrative cache, timed separately as a hit.
+    """
+    import timeit
+    from services import narrative_service
+
+    print(f"Narrative benchmark ({iterations} calls per length)")
+    print(f"{'length':>8} {'scenes':>7} {'format (us)':>12} {'per scene (us)':>15} {'cache hit (us)':>15}")
+
+    for length in narrative_service.get_available_lengths():
+        scenes = len(narrative_service.generate_structured_narrative("A brave knight", "fantasy", length))
+        format_timer = timeit.Timer(lambda: narrative_service._format_scenes("A brave knight", "fantasy", length))
+        hit_timer = timeit.Timer(lambda: narrative_service.generate_structured_narrative("A brave knight", "fantasy", length))
+        formatted = min(format_timer.repeat(repeat=5, number=iterations)) / iterations
+        hit = min(hit_timer.repeat(repeat=5, number=iterations)) / iterations
+        print(f"{length:>8} {scenes:>7} {formatted * 1e6:>12.1f} {formatted * 1e6 / scenes:>15.2f} {hit * 1e6:>15.1f}")
+
+
+def run_character_benchmark(sets: int):
+    """
+    Generate many seeded character sets, as catalog pre-warming does
+
+    Names are drawn from pools precomputed per style, so generation cost is
+    dominated by building the characters rather than by filtering name lists.
+    """
+    import random
+    from services import character_service, story_service
+
+    print(f"Character benchmark ({sets} sets per style)")
+    print(f"{'style':>10} {'pool':>5} {'sets/s':>10} {'duplicate names':>16}")
+
+    for style in story_service.get_available_styles():
+        duplicates = 0
+        start = time.perf_counter()
+        for seed in range(sets):
+            characters = character_service.generate_characters("A benchmark tale", style, rng=random.Random(seed))
+            duplicates += len(characters) - len({character.name for character in characters})
+        elapsed = time.perf_counter() - start
+        pool = len(character_service.name_pools.get(style, character_service.default_name_pool))
+        print(f"{style:>10} {pool:>5} {sets / elapsed:>10,.0f} {duplicates:>16}")
+
+
+def run_splice_benchmark(engine: str, length: str):
+    """
+    Full-story audio: one synthesis job vs splicing cached scene audio
+
+    Scenes are synthesized first, as a story request does; the spliced track
+    then only copies their frames, while the legacy path synthesizes the
+    whole text again.
+    """
+    import os
+    from services.tts_client import tts_client
+    from services.tts_engines import build_voice_configs
+    from services import story_service, narrative_service, audio_service
+    from tts_stub_server import start_stub_server
+
+    server = None
+    if engine == "gtts":
+        server = start_stub_server()
+        tts_client.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    audio_service.voice_configs = build_voice_configs(engine)
+    os.makedirs("static/audio", exist_ok=True)
+
+    scenes = narrative_service.generate_structured_narrative("A splice benchmark tale", "fantasy", length)
+    scene_texts = [scene["text"] for scene in scenes]
+    story_text = " ".join(scene_texts)
+
+    start = time.perf_counter()
+    for text in scene_texts:
+        audio_service.generate_speech(text, "woman")
+    scenes_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full_url = story_service.generate_full_story_audio(story_text)
+    full_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    spliced_url = story_service.generate_full_story_audio(story_text, scene_texts=scene_texts)
+    splice_elapsed = time.perf_counter() - start
+
+    print(f"Splice benchmark ({engine} engine, {length} story, {len(scene_texts)} scenes)")
+    print(f"Scene synthesis:          {scenes_elapsed:.3f}s")
+    print(f"Full-text synthesis:      {full_elapsed:.3f}s ({os.path.getsize(full_url.lstrip('/')) / 1024:.1f} KB)")
+    print(f"Splice of cached scenes:  {splice_elapsed:.3f}s ({os.path.getsize(spliced_url.lstrip('/')) / 1024:.1f} KB)")
+
+    if server:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TextTale benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    load = subparsers.add_parser("load", help="Concurrent load test against a running server")
+    load.add_argument("--url", default="http://localhost:8001")
+    load.add_argument("--concurrency", default="1,2,4,8,16")
+    load.add_argument("--requests", type=int, default=16)
+    load.add_argument("--length", default="short")
+
+    tts = subparsers.add_parser("tts", help="Pooled vs fresh TTS sessions against the local stub server")
+    tts.add_argument("--calls", type=int, default=200)
+    tts.add_argument("--workers", type=int, default=8)
+
+    memory = subparsers.add_parser("memory", help="Peak memory of full-story audio per story length")
+    memory.add_argument("--engine", choices=["gtts", "espeak", "formant"], default="gtts")
+
+    stress = subparsers.add_parser("stress", help="Parallel story generation storage stress test")
+    stress.add_argument("--stories", type=int, default=200)
+    stress.add_argument("--concurrency", type=int, default=32)
+    stress.add_argument("--prompts", type=int, default=50)
+
+    tracking = subparsers.add_parser("tracking", help="AudioCleanup tracking and cleanup cost")
+    tracking.add_argument("--files", type=int, default=100000)
+    tracking.add_argument("--untracked", type=int, default=100000)
+    tracking.add_argument("--threads", type=int, default=8)
+
+    narrative = subparsers.add_parser("narrative", help="generate_structured_narrative microbenchmark per story length")
+    narrative.add_argument("--iterations", type=int, default=2000)
+
+    characters = subparsers.add_parser("characters", help="Seeded character set generation throughput per style")
+    characters.add_argument("--sets", type=int, default=10000)
+
+    splice = subparsers.add_parser("splice", help="Full-story audio by synthesis vs splicing cached scenes")
+    splice.add_argument("--engine", choices=["gtts", "espeak", "formant"], default="formant")
+    splice.add_argument("--length", default="long")
+
+    args = parser.parse_args()
+
+    if args.command == "load":
+        levels = [int(level) for level in args.concurrency.split(",")]
+        run_load_test(args.url, levels, args.requests, args.length)
+    elif args.command == "tts":
+        run_tts_client_benchmark(args.calls, args.workers)
+    elif args.command == "memory":
+        run_memory_benchmark(args.engine)
+    elif args.command == "stress":
+        run_storage_stress_test(args.stories, args.concurrency, args.prompts)
+    elif args.command == "tracking":
+        run_tracking_benchmark(args.files, args.untracked, args.threads)
+    elif args.command == "narrative":
+        run_narrative_benchmark(args.iterations)
+    elif args.command == "characters":
+        run_character_benchmark(args.sets)
+    elif args.command == "splice":
+        run_splice_benchmark(args.engine, args.length)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Background Noise Library Script for TextTale
+Run this script to pregenerate the background noise tracks served from NOISE_LIBRARY_DIR
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+def main():
+    parser = argparse.ArgumentParser(description="Pregenerate the background noise library")
+    parser.add_argument("--duration", type=int, default=30, help="Track duration in seconds")
+    args = parser.parse_args()
+
+    # Load .env before the services read their configuration
+    load_dotenv()
+    from services import background_noise_service
+
+    print("🌲 TextTale Noise Library")
+    print("=" * 30)
+    print(f"📁 Library directory: {background_noise_service.library_dir}")
+
+    results = background_noise_service.build_library(args.duration)
+    failed = [noise_type for noise_type, path in results.items() if path is None]
+    print(f"✅ Built {len(results) - len(failed)} of {len(results)} noise tracks")
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
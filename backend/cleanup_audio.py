@@ -6,12 +6,17 @@ Run this script to manually clean up all generated audio files
 
 import sys
 from pathlib import Path
+from dotenv import load_dotenv
 
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
-from utils.cleanup import cleanup_all
+# Load .env before the utilities read their configuration
+load_dotenv()
+
+from utils.audio_storage import AUDIO_ROOT
+from utils.cleanup import init_cleanup, cleanup_all
 
 def main():
     print("🧹 TextTale Audio Cleanup")
@@ -24,6 +29,7 @@ def main():
         return
     
     print("🗑️  Cleaning up all audio files...")
+    init_cleanup(AUDIO_ROOT)
     cleanup_all()
     print("✅ Cleanup completed!")
 
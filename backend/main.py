@@ -4,38 +4,120 @@ Clean, service-based architecture for AI story generation
 """
 
 import os
-from fastapi import FastAPI, HTTPException
+import re
+import json
+from typing import List
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 
+# Load environment variables before the services read their configuration
+load_dotenv()
+
 # Import services
 from services import (
     story_service,
     audio_service,
+    narrative_service,
     StoryRequest,
     StoryResponse,
     AudioRequest,
     AudioResponse,
-    CleanupResponse
+    CleanupResponse,
+    CleanupJobStatus,
+    JobResponse
 )
-from utils.cleanup import init_cleanup, cleanup_now
-
-# Load environment variables
-load_dotenv()
+from utils.cleanup import init_cleanup, start_cleanup_job, get_cleanup_job, touch_audio_file
+from utils.job_queue import job_queue
+from utils.audio_storage import AUDIO_ROOT
+from services.tts_engines import ENGINES
+from utils.worker_pool import tts_pool
+from utils.audio_gc import audio_gc
 
 # Initialize cleanup manager
 cleanup_manager = init_cleanup("static/audio")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run the background audio garbage collector while the server is up
+    
+    In production server workers it only expires the TTS cache; the master
+    collects the files of all workers.
+    """
+    audio_gc.start()
+    yield
+    audio_gc.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="TextTale API", 
     version="2.0.0",
-    description="AI-powered story generation with clean service architecture"
+    description="AI-powered story generation with clean service architecture",
+    lifespan=lifespan
 )
 
 # Create static directory for audio
 os.makedirs("static/audio", exist_ok=True)
+
+# Content hash embedded in generated audio file names
+AUDIO_DIGEST_PATTERN = re.compile(r"_([0-9a-f]{32})\.\w+$")
+AUDIO_MEDIA_TYPES = {engine.extension: engine.media_type for engine in ENGINES.values()}
+
+
+@app.api_route("/static/audio/{file_path:path}", methods=["GET", "HEAD"])
+async def serve_audio(file_path: str, request: Request):
+    """
+    Serve generated audio with range and conditional request support
+    
+    Content-addressed files get a strong ETag from their content hash and
+    immutable caching, so replays are answered with 304 or 206 responses.
+    Registered before the /static mount so it takes precedence.
+    """
+    audio_root = os.path.realpath(AUDIO_ROOT)
+    full_path = os.path.realpath(os.path.join(audio_root, file_path))
+    if os.path.commonpath([audio_root, full_path]) != audio_root or os.path.basename(full_path).startswith("."):
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    try:
+        stat_result = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="Not found")
+    if not os.path.isfile(full_path):
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    digest = AUDIO_DIGEST_PATTERN.search(full_path)
+    if digest:
+        headers = {
+            "ETag": f'"{digest.group(1)}"',
+            "Cache-Control": "public, max-age=31536000, immutable"
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or headers["ETag"] in tags:
+            return Response(status_code=304, headers=headers)
+    else:
+        headers = {"Cache-Control": "no-cache"}
+    
+    # Keep served files alive for the audio garbage collector
+    touch_audio_file(f"{AUDIO_ROOT}/{os.path.relpath(full_path, audio_root)}")
+    
+    # FileResponse handles Range/If-Range and streams via pathsend where the server supports it
+    extension = full_path.rsplit(".", 1)[-1]
+    return FileResponse(
+        full_path,
+        headers=headers,
+        media_type=AUDIO_MEDIA_TYPES.get(extension, "application/octet-stream"),
+        stat_result=stat_result
+    )
+
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Enable CORS
@@ -80,13 +162,15 @@ async def generate_story(request: StoryRequest):
                 detail="; ".join(validation["errors"])
             )
         
-        # Generate story using service
-        result = story_service.generate_story(
+        # Generate story using service, off the event loop
+        result = await story_service.generate_story_async(
             prompt=request.text,
             style=request.style,
             length=request.length,
             characters=request.characters,
             background_noise=request.background_noise,
+            seed=request.seed,
+            lazy_audio=request.lazy_audio,
             include_audio=True
         )
         
@@ -98,6 +182,7 @@ async def generate_story(request: StoryRequest):
             story=result["story"],
             characters=result["characters"],
             introduction=result["introduction"],
+            missingAudio=result["missingAudio"],
             message=result["message"]
         )
         
@@ -108,11 +193,184 @@ async def generate_story(request: StoryRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.post("/api/generate-story/stream")
+async def generate_story_stream(request: StoryRequest):
+    """
+    Generate a story and stream it as NDJSON
+    
+    Emits the characters and introduction first, then each scene (with its
+    sceneNumber) as soon as its audio is ready. The background noise URL
+    arrives in its own "background" event once the track is ready.
+    """
+    validation = story_service.validate_story_request(
+        request.text, 
+        request.style, 
+        request.length
+    )
+    
+    if not validation["valid"]:
+        raise HTTPException(
+            status_code=400, 
+            detail="; ".join(validation["errors"])
+        )
+    
+    events = story_service.generate_story_stream(
+        prompt=request.text,
+        style=request.style,
+        length=request.length,
+        characters=request.characters,
+        background_noise=request.background_noise,
+        seed=request.seed
+    )
+    
+    # Starlette iterates the sync generator in its threadpool
+    return StreamingResponse(
+        (json.dumps(event) + "\n" for event in events),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/api/generate-stories")
+async def generate_stories(requests: List[StoryRequest]):
+    """
+    Generate a batch of stories and stream the results
+    
+    Streams a JSON object whose "results" array receives each story (with the
+    index of its request) as soon as it is done, followed by aggregate
+    throughput "stats" for the whole batch.
+    """
+    if not requests:
+        raise HTTPException(status_code=400, detail="At least one story request is required")
+    if len(requests) > story_service.batch_max_stories:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {story_service.batch_max_stories} stories per batch"
+        )
+    
+    for i, request in enumerate(requests):
+        validation = story_service.validate_story_request(
+            request.text, 
+            request.style, 
+            request.length
+        )
+        if not validation["valid"]:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Request {i}: " + "; ".join(validation["errors"])
+            )
+    
+    events = story_service.generate_stories_stream([
+        {
+            "prompt": request.text,
+            "style": request.style,
+            "length": request.length,
+            "characters": request.characters,
+            "background_noise": request.background_noise,
+            "seed": request.seed,
+            "lazy_audio": request.lazy_audio
+        }
+        for request in requests
+    ])
+    
+    def body():
+        yield '{"results":['
+        separator = ""
+        for event in events:
+            if event["type"] == "stats":
+                yield '],"stats":' + json.dumps(event["stats"]) + "}"
+                continue
+            result = StoryResponse(**event["result"]).model_dump()
+            yield separator + json.dumps({"index": event["index"], **result})
+            separator = ","
+    
+    # Starlette iterates the sync generator in its threadpool
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@app.get("/api/story-audio/{story_id}/scenes/{scene_number}")
+async def get_story_scene_audio(story_id: str, scene_number: int):
+    """
+    Resolve the placeholder audio URL of a lazy-audio scene
+    
+    Synthesizes the scene on first fetch (prefetching the following scenes)
+    and redirects to its content-addressed audio file.
+    """
+    try:
+        audio_url = await run_in_threadpool(story_service.get_lazy_scene_audio, story_id, scene_number)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Story audio not found or expired")
+    if not audio_url:
+        raise HTTPException(status_code=503, detail="Scene audio could not be generated")
+    return RedirectResponse(audio_url, status_code=307, headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/api/story-audio/{story_id}/background")
+async def get_story_background_audio(story_id: str):
+    """Resolve the placeholder background noise URL of a lazy-audio story"""
+    try:
+        audio_url = await run_in_threadpool(story_service.get_lazy_background_audio, story_id)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Story audio not found or expired")
+    if not audio_url:
+        raise HTTPException(status_code=503, detail="Background noise could not be generated")
+    return RedirectResponse(audio_url, status_code=307, headers={"Cache-Control": "no-cache"})
+
+
+@app.post("/api/jobs/generate-story", response_model=JobResponse)
+async def enqueue_story_job(request: StoryRequest):
+    """
+    Queue a story for the story worker processes
+    
+    Returns at once with a job id; poll /api/jobs/{job_id} for the result.
+    Jobs survive API and worker restarts. Run story_worker.py to process them.
+    """
+    validation = story_service.validate_story_request(
+        request.text, 
+        request.style, 
+        request.length
+    )
+    
+    if not validation["valid"]:
+        raise HTTPException(
+            status_code=400, 
+            detail="; ".join(validation["errors"])
+        )
+    
+    job_id = await run_in_threadpool(job_queue.enqueue, "story", {
+        "prompt": request.text,
+        "style": request.style,
+        "length": request.length,
+        "characters": request.characters,
+        "background_noise": request.background_noise,
+        "seed": request.seed  # jobs pre-generate stories, so audio is synthesized up front
+    })
+    return await get_job(job_id)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Get the status, and once completed the story, of a queued job"""
+    job = await run_in_threadpool(job_queue.get, job_id)
+    if job is None or job["kind"] != "story":
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return JobResponse(
+        jobId=job["id"],
+        status=job["status"],
+        attempts=job["attempts"],
+        createdAt=job["created_at"],
+        startedAt=job["started_at"],
+        finishedAt=job["finished_at"],
+        result=job["result"],
+        error=job["error"]
+    )
+
+
 @app.post("/api/text-to-speech", response_model=AudioResponse)
 async def text_to_speech(request: AudioRequest):
     """Generate audio from text using TTS"""
     try:
-        audio_url = audio_service.generate_speech(request.text, request.voice)
+        audio_url = await run_in_threadpool(audio_service.generate_speech, request.text, request.voice)
         
         if audio_url:
             return AudioResponse(
@@ -138,12 +396,18 @@ async def text_to_speech(request: AudioRequest):
 
 @app.post("/api/cleanup-audio", response_model=CleanupResponse)
 async def cleanup_audio():
-    """Manually trigger audio cleanup"""
+    """Queue a background audio cleanup job and return its id"""
     try:
-        cleanup_now()
+        job_id = await run_in_threadpool(start_cleanup_job)
+        if job_id is None:
+            return CleanupResponse(
+                success=False,
+                message="Audio cleanup is not initialized"
+            )
         return CleanupResponse(
             success=True,
-            message="Audio cleanup completed"
+            message="Audio cleanup job queued",
+            jobId=job_id
         )
     except Exception as e:
         return CleanupResponse(
@@ -152,6 +416,28 @@ async def cleanup_audio():
         )
 
 
+@app.get("/api/cleanup-audio/{job_id}", response_model=CleanupJobStatus)
+async def cleanup_audio_status(job_id: str):
+    """Get progress and throughput of a cleanup job"""
+    job = await run_in_threadpool(get_cleanup_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Cleanup job not found")
+    return CleanupJobStatus(**job)
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Get TTS worker pool, cache and audio GC metrics"""
+    return {
+        "tts_pool": tts_pool.stats(),
+        "tts_cache": audio_service.cache.stats(),
+        "narrative_cache": narrative_service.cache.stats(),
+        "story_cache": story_service.response_cache.stats(),
+        "job_queue": job_queue.stats(),
+        "audio_gc": audio_gc.stats()
+    }
+
+
 @app.get("/api/story-options")
 async def get_story_options():
     """Get available story generation options"""
@@ -169,12 +455,13 @@ if __name__ == "__main__":
     print("Audio cleanup enabled - generated files will be removed on exit")
     print("Starting server on http://localhost:8001")
     print("Press Ctrl+C to stop the server and clean up audio files")
+    print("For multiple workers use: python start_server.py --production")
     print("-" * 50)
     
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8001,
-        reload=True,
+        reload=os.getenv("TEXTTALE_ENV") != "production",
         log_level="info"
     )
\ No newline at end of file
@@ -16,6 +16,8 @@ from .models import (
     AudioRequest, 
     AudioResponse, 
     CleanupResponse,
+    CleanupJobStatus,
+    JobResponse,
     LENGTH_CONFIG
 )
 
@@ -32,5 +34,7 @@ __all__ = [
     'AudioRequest',
     'AudioResponse',
     'CleanupResponse',
+    'CleanupJobStatus',
+    'JobResponse',
     'LENGTH_CONFIG'
 ]
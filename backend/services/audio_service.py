@@ -4,27 +4,93 @@ Handles all audio generation and management
 """
 
 import os
-import time
-import io
-from typing import Optional
-from gtts import gTTS
-from utils.cleanup import track_audio_file
+import json
+import hashlib
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional
+from services.tts_engines import TTSEngine, get_engine, build_voice_configs
+from utils.cleanup import track_audio_file, protect_audio_file, release_audio_file, touch_audio_file
+from utils.lru_cache import LRUCache
+from utils.audio_gc import audio_gc
+from utils.single_flight import SingleFlight
+from utils.audio_storage import atomic_audio_file, audio_file_path, audio_url
+from utils.audio_splice import splice_audio
 
 
 class AudioService:
     """Service for handling text-to-speech audio generation"""
     
     def __init__(self):
-        self.voice_configs = {
-            "woman": {"lang": "en", "tld": "com", "slow": False},  # American English for clear woman's voice
-            "man": {"lang": "en", "tld": "com.au", "slow": False},  # Australian accent for deeper, more masculine voice
-            "child": {"lang": "en", "tld": "co.uk", "slow": True}  # Slower speech for child-like voice
-        }
+        # Each voice maps to an engine plus its parameters (TTS_ENGINE selects the engine)
+        self.voice_configs = build_voice_configs()
         self.default_voice = "woman"
+        
+        # Content-addressed cache of synthesized speech: hash(text + voice config) -> file path
+        self.cache = LRUCache(
+            max_entries=int(os.getenv("TTS_CACHE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024))),
+            max_age=float(os.getenv("TTS_CACHE_MAX_AGE", "3600")),
+            on_evict=self._on_cache_evict
+        )
+        # Expired entries must release their files even when nobody asks for them
+        audio_gc.watch_cache(self.cache)
+        
+        # Concurrent misses for the same text and voice share one synthesis
+        self._single_flight = SingleFlight()
+        
+        # Scenes per batched TTS job for batch-capable engines (0 disables batch mode)
+        self.batch_size = int(os.getenv("TTS_BATCH_SIZE", "0"))
+        if self.batch_size > 0:
+            engine = self._engine_for(self.voice_configs[self.default_voice])
+            if not engine.supports_batch:
+                print(f"⚠️  TTS_BATCH_SIZE={self.batch_size} is ignored: the {engine.name} engine cannot batch")
+    
+    def _cache_key(self, text: str, config: dict) -> str:
+        """Build a content hash from the text and the voice configuration"""
+        payload = json.dumps({"text": text, "config": config}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _engine_for(self, config: dict) -> TTSEngine:
+        """Get the engine a voice configuration uses"""
+        return get_engine(config["engine"])
+    
+    def _synthesize(self, text: str, config: dict, fp):
+        """Synthesize text with the voice configuration's engine into fp"""
+        params = {key: value for key, value in config.items() if key != "engine"}
+        self._engine_for(config).synthesize(text, fp, **params)
+    
+    def _on_cache_evict(self, key: str, audio_path: str):
+        """Hand evicted files back to the regular cleanup lifecycle"""
+        release_audio_file(audio_path)
+    
+    def get_cached_speech(self, text: str, voice: str = None) -> Optional[str]:
+        """
+        Look up previously synthesized speech without calling the TTS backend
+        
+        Args:
+            text: Text that was converted to speech
+            voice: Voice type (woman, man, child)
+            
+        Returns:
+            Audio URL or None on cache miss
+        """
+        voice = voice or self.default_voice
+        config = self.voice_configs.get(voice, self.voice_configs[self.default_voice])
+        key = self._cache_key(text, config)
+        audio_path = self.cache.get(key)
+        if audio_path is None:
+            return None
+        if not os.path.exists(audio_path):
+            # File was removed behind our back - treat as a miss
+            self.cache.pop(key)
+            release_audio_file(audio_path)
+            return None
+        touch_audio_file(audio_path)
+        return audio_url(audio_path)
     
     def generate_speech(self, text: str, voice: str = None) -> Optional[str]:
         """
-        Generate speech using Google Text-to-Speech API
+        Generate speech with the voice's TTS engine
         
         Args:
             text: Text to convert to speech
@@ -39,39 +105,181 @@ class AudioService:
         voice = voice or self.default_voice
         config = self.voice_configs.get(voice, self.voice_configs[self.default_voice])
         
+        cached_url = self.get_cached_speech(text, voice)
+        if cached_url:
+            print(f"TTS cache hit: {cached_url}")
+            return cached_url
+        
+        cache_key = self._cache_key(text, config)
+        return self._single_flight.do(cache_key, self._synthesize_speech, text, voice, config, cache_key)
+    
+    def _synthesize_speech(self, text: str, voice: str, config: dict, cache_key: str) -> Optional[str]:
+        """Synthesize one cache miss to disk and register it in the cache"""
+        # Another caller may have finished the same text just before us
+        cached_url = self.get_cached_speech(text, voice)
+        if cached_url:
+            return cached_url
+        
         try:
             print(f"Generating TTS with voice: {voice}, config: {config}")
             
-            # Create TTS object with voice configuration
-            tts = gTTS(
-                text=text, 
-                lang=config["lang"], 
-                tld=config["tld"],
-                slow=config["slow"]
-            )
-            
-            # Save to bytes
-            audio_buffer = io.BytesIO()
-            tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
+            # Audio file named by voice identifier and content hash, in a hash-sharded directory
+            audio_path = audio_file_path(f"speech_{voice}", cache_key, self._engine_for(config).extension)
             
-            # Save audio file with voice identifier
-            audio_filename = f"speech_{voice}_{int(time.time())}.mp3"
-            audio_path = f"static/audio/{audio_filename}"
+            # Stream the engine output straight to disk
+            with atomic_audio_file(audio_path) as f:
+                self._synthesize(text, config, f)
             
-            with open(audio_path, "wb") as f:
-                f.write(audio_buffer.getvalue())
+            self._register_cached_file(cache_key, audio_path)
             
-            # Track the generated file for cleanup
-            track_audio_file(audio_path)
-            
-            print(f"TTS file saved: {audio_filename}")
-            return f"/static/audio/{audio_filename}"
+            print(f"TTS file saved: {audio_path}")
+            return audio_url(audio_path)
             
         except Exception as e:
             print(f"TTS Error: {e}")
             return None
     
+    def _cached_path(self, key: str) -> Optional[str]:
+        """Get the cached file of a cache key if it is still on disk"""
+        audio_path = self.cache.get(key)
+        if audio_path is None or not os.path.exists(audio_path):
+            return None
+        return audio_path
+    
+    def concatenate_speech(self, texts: List[str], voice: str = None) -> Optional[str]:
+        """
+        Join the cached speech of several texts into one audio file
+        
+        Encoded frames (MP3) or PCM data (WAV) are copied as-is without
+        re-encoding. Every text must already be in the speech cache.
+        
+        Args:
+            texts: Texts in playback order
+            voice: Voice type (woman, man, child)
+            
+        Returns:
+            Audio URL, or None if some text is not cached or splicing fails
+        """
+        voice = voice or self.default_voice
+        config = self.voice_configs.get(voice, self.voice_configs[self.default_voice])
+        keys = [self._cache_key(text, config) for text in texts if text and text.strip()]
+        if not keys:
+            return None
+        
+        paths = [self._cached_path(key) for key in keys]
+        if None in paths:
+            return None
+        
+        # The joined file is addressed by its parts
+        story_key = hashlib.sha256(json.dumps({"parts": keys}).encode("utf-8")).hexdigest()
+        story_path = self._cached_path(story_key)
+        if story_path:
+            touch_audio_file(story_path)
+            return audio_url(story_path)
+        
+        try:
+            extension = self._engine_for(config).extension
+            story_path = audio_file_path(f"story_{voice}", story_key, extension)
+            with atomic_audio_file(story_path) as f:
+                splice_audio(paths, extension, f)
+            self._register_cached_file(story_key, story_path)
+            print(f"Spliced {len(paths)} cached files into {story_path}")
+            return audio_url(story_path)
+        except (OSError, ValueError) as e:
+            print(f"Audio splice error: {e}")
+            return None
+    
+    def _register_cached_file(self, cache_key: str, audio_path: str):
+        """Track a new file for cleanup and keep it alive while it is cached"""
+        track_audio_file(audio_path)
+        protect_audio_file(audio_path)
+        self.cache.put(cache_key, audio_path, size=os.path.getsize(audio_path))
+    
+    def batch_enabled(self, voice: str = None) -> bool:
+        """Whether scenes for a voice are synthesized in batches (TTS_BATCH_SIZE > 0 and a batch-capable engine)"""
+        voice = voice or self.default_voice
+        config = self.voice_configs.get(voice, self.voice_configs[self.default_voice])
+        return self.batch_size > 0 and self._engine_for(config).supports_batch
+    
+    def generate_batch_speech(self, texts: List[str], voice: str = None, on_result: Callable[[int, Optional[str]], None] = None) -> List[Optional[str]]:
+        """
+        Generate speech for several texts in one engine call
+        
+        The engine renders all uncached texts in a single pass and splits the
+        output at the recorded text boundaries, writing one content-addressed
+        file per text, so callers get the same per-scene URLs as
+        generate_speech. Texts another caller is already synthesizing are not
+        rendered again; their result is shared instead. Requires an engine
+        with supports_batch.
+        
+        Args:
+            texts: Texts to convert to speech
+            voice: Voice type (woman, man, child)
+            on_result: Optional callback(index, audio_url) invoked as each text finishes
+            
+        Returns:
+            List of audio file paths (None where synthesis failed)
+        """
+        voice = voice or self.default_voice
+        config = self.voice_configs.get(voice, self.voice_configs[self.default_voice])
+        engine = self._engine_for(config)
+        results: List[Optional[str]] = [None] * len(texts)
+        
+        def finish(index: int, url: Optional[str]):
+            results[index] = url
+            if on_result:
+                on_result(index, url)
+        
+        # Serve cache hits and fold duplicate texts into one synthesis
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                finish(i, None)
+                continue
+            cached_url = self.get_cached_speech(text, voice)
+            if cached_url:
+                finish(i, cached_url)
+            else:
+                pending.setdefault(text, []).append(i)
+        
+        # Lead the single flight of every text nobody else is synthesizing
+        leading, following = [], []
+        for text in pending:
+            cache_key = self._cache_key(text, config)
+            future, leader = self._single_flight.join(cache_key)
+            (leading if leader else following).append((text, cache_key, future))
+        
+        if leading:
+            print(f"Generating batched TTS for {len(leading)} texts with voice: {voice}")
+            paths = [audio_file_path(f"speech_{voice}", cache_key, engine.extension) for _, cache_key, _ in leading]
+            urls: List[Optional[str]] = [None] * len(leading)
+            try:
+                with ExitStack() as stack:
+                    fps = [stack.enter_context(atomic_audio_file(path)) for path in paths]
+                    params = {key: value for key, value in config.items() if key != "engine"}
+                    engine.synthesize_batch([text for text, _, _ in leading], fps, **params)
+                for n, ((_, cache_key, _), path) in enumerate(zip(leading, paths)):
+                    self._register_cached_file(cache_key, path)
+                    urls[n] = audio_url(path)
+            except Exception as e:
+                print(f"Batched TTS Error: {e}")
+            finally:
+                for (text, cache_key, future), url in zip(leading, urls):
+                    self._single_flight.finish(cache_key, future, url)
+                    for i in pending[text]:
+                        finish(i, url)
+        
+        for text, _, future in following:
+            try:
+                url = future.result()
+            except Exception as e:
+                print(f"Batched TTS Error: {e}")
+                url = None
+            for i in pending[text]:
+                finish(i, url)
+        
+        return results
+    
     def generate_scene_audio(self, scene_text: str, voice: str, scene_index: int) -> Optional[str]:
         """
         Generate audio for a single scene
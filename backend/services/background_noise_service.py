@@ -4,10 +4,14 @@ Handles background audio for immersive storytelling
 """
 
 import os
-import time
-import random
-from typing import Optional, Dict, List
-from utils.cleanup import track_audio_file
+import json
+import hashlib
+import threading
+from typing import Optional, Dict, List, Tuple
+from utils.cleanup import track_audio_file, protect_audio_file, release_audio_file, touch_audio_file
+from utils.single_flight import SingleFlight
+from utils.audio_storage import atomic_audio_file, audio_file_path, audio_url
+from services.tts_engines import get_engine, build_voice_configs
 
 
 class BackgroundNoiseService:
@@ -44,10 +48,24 @@ class BackgroundNoiseService:
                 "elements": []
             }
         }
+        
+        # Engine and voice used to render noise tracks
+        self.voice_config = build_voice_configs()["woman"]
+        
+        # Pregenerated noise tracks, served as-is when present
+        self.library_dir = self._resolve_library_dir(os.getenv("NOISE_LIBRARY_DIR", "static/noise"))
+        
+        # Noise tracks built by this process: (noise_type, duration) -> audio path
+        self._assets: Dict[Tuple[str, int], str] = {}
+        self._assets_lock = threading.Lock()
+        self._single_flight = SingleFlight()
     
     def generate_background_noise(self, noise_type: str, duration: int = 30) -> Optional[str]:
         """
-        Generate background noise audio file
+        Get the background noise track for a noise type and duration
+        
+        Each (noise_type, duration) track is looked up in the prebuilt library
+        first, otherwise synthesized once and shared by all scenes and requests.
         
         Args:
             noise_type: Type of background noise
@@ -59,40 +77,106 @@ class BackgroundNoiseService:
         if noise_type == "none" or noise_type not in self.noise_types:
             return None
         
+        for extension in ("mp3", "wav"):
+            library_path = self._library_path(noise_type, duration, extension)
+            if os.path.exists(library_path):
+                return audio_url(library_path)
+        
+        key = (noise_type, duration)
+        with self._assets_lock:
+            audio_path = self._assets.get(key)
+        if audio_path and os.path.exists(audio_path):
+            touch_audio_file(audio_path)
+            return audio_url(audio_path)
+        
+        return self._single_flight.do(key, self._build_background_noise, noise_type, duration)
+    
+    @staticmethod
+    def _resolve_library_dir(library_dir: str) -> str:
+        """
+        Validate the noise library directory
+        
+        Library tracks are served by the /static mount, so the directory must
+        lie inside static/. It is returned relative to the working directory
+        so audio_url builds a working URL.
+        
+        Args:
+            library_dir: Configured directory, relative or absolute
+            
+        Returns:
+            Directory path relative to the working directory
+        """
+        static_root = os.path.abspath("static")
+        resolved = os.path.abspath(library_dir)
+        if os.path.commonpath([static_root, resolved]) != static_root:
+            print(f"⚠️  NOISE_LIBRARY_DIR {library_dir} is not under static/ - using static/noise")
+            return "static/noise"
+        return os.path.relpath(resolved).replace(os.sep, "/")
+    
+    def _library_path(self, noise_type: str, duration: int, extension: str = "mp3") -> str:
+        """Path of a pregenerated noise track in the asset library"""
+        return f"{self.library_dir}/background_{noise_type}_{duration}.{extension}"
+    
+    def _build_background_noise(self, noise_type: str, duration: int) -> Optional[str]:
+        """Synthesize a noise track and register it as a shared asset"""
         try:
             noise_config = self.noise_types[noise_type]
             
             # Create a descriptive text for TTS that represents the ambient sound
             noise_text = f"Ambient {noise_config['description']} sounds playing softly in the background for {duration} seconds"
             
-            # Generate audio using gTTS
-            from gtts import gTTS
-            import io
+            # Generate audio with the configured TTS engine
+            engine = get_engine(self.voice_config["engine"])
+            params = {key: value for key, value in self.voice_config.items() if key != "engine"}
             
-            tts = gTTS(text=noise_text, lang="en", tld="com", slow=False)
+            # Save audio file, one per (noise_type, duration) and voice, streamed straight to disk
+            digest = hashlib.sha256(json.dumps({"text": noise_text, "config": self.voice_config}, sort_keys=True).encode("utf-8")).hexdigest()
+            audio_path = audio_file_path(f"background_{noise_type}", digest, engine.extension)
             
-            # Save to bytes
-            audio_buffer = io.BytesIO()
-            tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
+            with atomic_audio_file(audio_path) as f:
+                engine.synthesize(noise_text, f, **params)
             
-            # Save audio file
-            audio_filename = f"background_{noise_type}_{int(time.time())}.mp3"
-            audio_path = f"static/audio/{audio_filename}"
-            
-            with open(audio_path, "wb") as f:
-                f.write(audio_buffer.getvalue())
-            
-            # Track the generated file for cleanup
+            # Track the generated file for cleanup; shared assets survive manual cleanups
             track_audio_file(audio_path)
+            protect_audio_file(audio_path)
+            with self._assets_lock:
+                self._assets[(noise_type, duration)] = audio_path
             
-            print(f"Background noise generated: {audio_filename}")
-            return f"/static/audio/{audio_filename}"
+            print(f"Background noise generated: {audio_path}")
+            return audio_url(audio_path)
             
         except Exception as e:
             print(f"Background noise generation error: {e}")
             return None
     
+    def build_library(self, duration: int = 30) -> Dict[str, Optional[str]]:
+        """
+        Pregenerate the noise asset library on disk
+        
+        Args:
+            duration: Duration in seconds of the tracks to build
+            
+        Returns:
+            Dictionary mapping noise type to library file path (None if failed)
+        """
+        os.makedirs(self.library_dir, exist_ok=True)
+        results = {}
+        for noise_type in self.noise_types:
+            if noise_type == "none":
+                continue
+            built_url = self._build_background_noise(noise_type, duration)
+            if not built_url:
+                results[noise_type] = None
+                continue
+            library_path = self._library_path(noise_type, duration, built_url.rsplit(".", 1)[-1])
+            os.replace(built_url.lstrip("/"), library_path)
+            release_audio_file(built_url.lstrip("/"))
+            with self._assets_lock:
+                self._assets.pop((noise_type, duration), None)
+            results[noise_type] = library_path
+            print(f"Library noise track built: {library_path}")
+        return results
+    
     def get_available_noise_types(self) -> List[str]:
         """Get list of available background noise types"""
         return list(self.noise_types.keys())
@@ -4,7 +4,7 @@ Handles character generation, development, and management
 """
 
 import random
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from services.models import Character
 
 
@@ -19,12 +19,31 @@ class CharacterService:
             "Zara", "Kai", "Nova", "Luna", "Atlas", "Orion", "Vega", "Nyx", "Cosmo", "Stella",
             "Felix", "Hazel", "Ivy", "Jasper", "Kira", "Max", "Nora", "Oscar", "Penny", "Quincy",
             "Rosa", "Sam", "Tess", "Uri", "Vera", "Wade", "Xara", "Yara", "Zoe", "Aiden",
-            "Bella", "Cora", "Dean", "Eva", "Finn", "Grace", "Hugo", "Ivy", "Jake", "Kate",
-            "Liam", "Mia", "Noah", "Olivia", "Paul", "Quinn", "Rose", "Sam", "Tara", "Uma",
-            "Victor", "Willa", "Xander", "Yara", "Zara", "Aaron", "Beth", "Caleb", "Diana",
+            "Bella", "Cora", "Dean", "Eva", "Finn", "Grace", "Hugo", "Jake", "Kate",
+            "Liam", "Mia", "Noah", "Olivia", "Paul", "Rose", "Tara", "Uma",
+            "Victor", "Willa", "Xander", "Aaron", "Beth", "Caleb", "Diana",
             "Ethan", "Faith", "Gabe", "Hope", "Ian", "Jade", "Kyle", "Lily", "Mark", "Nina"
         ]
         
+        # Extra names that fit a particular story style
+        self.style_names = {
+            "fantasy": ["Aldric", "Brienne", "Cedric", "Elowen", "Gareth", "Isolde", "Lorien", "Merrin", "Rhiannon", "Thorne", "Wren", "Ysolde"],
+            "sci-fi": ["Axon", "Cyra", "Dax", "Echo", "Ion", "Juno", "Lyra", "Neo", "Rho", "Tycho", "Vesper", "Zenith"],
+            "mystery": ["Ada", "Clement", "Edith", "Harriet", "Julian", "Margot", "Miles", "Rupert", "Sylvia", "Theo", "Vivian", "Walter"],
+            "romance": ["Adele", "Camille", "Elena", "Gabriel", "Julia", "Lucas", "Mateo", "Celeste", "Rafael", "Sienna", "Valentina", "Amelie"],
+            "adventure": ["Amara", "Bodhi", "Cruz", "Dakota", "Everett", "Indy", "Knox", "Marco", "Remy", "Santiago", "Tamsin", "Zane"],
+            "horror": ["Agatha", "Ambrose", "Damien", "Ezra", "Lenore", "Mortimer", "Ophelia", "Silas", "Thaddeus", "Ursula", "Victoria", "Wednesday"],
+            "comedy": ["Bart", "Bubbles", "Chip", "Dottie", "Gus", "Mabel", "Otis", "Pip", "Rufus", "Skip", "Tilly", "Waldo"],
+            "drama": ["Beatrice", "Charlotte", "Eleanor", "Frederick", "Henry", "Isabel", "Leonard", "Madeleine", "Nathaniel", "Philippa", "Samuel", "Theodora"]
+        }
+        
+        # Name pools per style without duplicates, built once
+        self.default_name_pool = tuple(self.character_names)
+        self.name_pools = {
+            style: tuple(dict.fromkeys(self.character_names + names))
+            for style, names in self.style_names.items()
+        }
+        
         self.character_traits = [
             "brave", "wise", "mysterious", "kind", "cunning", "loyal", "adventurous", "gentle",
             "fierce", "curious", "determined", "compassionate", "clever", "honest", "bold", "patient",
@@ -41,7 +60,7 @@ class CharacterService:
             "companion": "A close friend who accompanies the protagonist"
         }
     
-    def generate_characters(self, prompt: str, style: str, user_characters: List[str] = None) -> List[Character]:
+    def generate_characters(self, prompt: str, style: str, user_characters: List[str] = None, rng: Optional[random.Random] = None) -> List[Character]:
         """
         Generate characters for the story
         
@@ -49,32 +68,35 @@ class CharacterService:
             prompt: Story prompt to base characters on
             style: Story style/genre
             user_characters: User-provided character names
+            rng: Per-request random generator; a seeded one makes the
+                characters reproducible (defaults to a fresh unseeded one)
             
         Returns:
             List of Character objects
         """
+        rng = rng or random.Random()
         characters = []
         
         # Add user-provided characters
         if user_characters:
             for i, name in enumerate(user_characters[:3]):  # Limit to 3 user characters
                 role = "protagonist" if i == 0 else "ally"
-                character = self._create_character(name, role, prompt, style)
+                character = self._create_character(name, role, prompt, style, rng)
                 characters.append(character)
         
         # Generate additional characters if needed
         num_additional = max(0, 3 - len(characters))
         for i in range(num_additional):
-            name = self._generate_random_name(exclude=[c.name for c in characters])
-            role = self._assign_role(len(characters))
-            character = self._create_character(name, role, prompt, style)
+            name = self._generate_random_name(rng, style, exclude={c.name for c in characters})
+            role = self._assign_role(len(characters), rng)
+            character = self._create_character(name, role, prompt, style, rng)
             characters.append(character)
         
         return characters
     
-    def _create_character(self, name: str, role: str, prompt: str, style: str) -> Character:
+    def _create_character(self, name: str, role: str, prompt: str, style: str, rng: random.Random) -> Character:
         """Create a character with description"""
-        traits = random.sample(self.character_traits, 3)
+        traits = rng.sample(self.character_traits, 3)
         trait_text = ", ".join(traits)
         
         description = f"{name} is a {trait_text} character in this {style} story. {self.character_roles.get(role, 'A character in the story')}. They play a crucial role in {prompt.lower()}."
@@ -85,20 +107,41 @@ class CharacterService:
             role=role
         )
     
-    def _generate_random_name(self, exclude: List[str] = None) -> str:
-        """Generate a random character name"""
-        exclude = exclude or []
-        available_names = [name for name in self.character_names if name not in exclude]
-        return random.choice(available_names)
+    def _generate_random_name(self, rng: random.Random, style: str = None, exclude: Set[str] = None) -> str:
+        """
+        Pick a random name from the style's name pool
+        
+        Draws until the name is not excluded, which takes O(1) expected draws
+        while the exclusion set is small relative to the pool.
+        
+        Args:
+            rng: Per-request random generator
+            style: Story style selecting the name pool
+            exclude: Names already taken
+            
+        Returns:
+            Character name
+        """
+        pool = self.name_pools.get(style, self.default_name_pool)
+        exclude = exclude or set()
+        
+        if len(exclude) * 2 < len(pool):
+            while True:
+                name = rng.choice(pool)
+                if name not in exclude:
+                    return name
+        
+        available_names = [name for name in pool if name not in exclude]
+        return rng.choice(available_names or pool)
     
-    def _assign_role(self, character_count: int) -> str:
+    def _assign_role(self, character_count: int, rng: random.Random) -> str:
         """Assign a role based on character count"""
         if character_count == 0:
             return "protagonist"
         elif character_count == 1:
             return "ally"
         else:
-            return random.choice(["mentor", "guardian", "mystic", "companion"])
+            return rng.choice(["mentor", "guardian", "mystic", "companion"])
     
     def generate_story_introduction(self, prompt: str, style: str, characters: List[Character]) -> str:
         """
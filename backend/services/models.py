@@ -14,6 +14,8 @@ class StoryRequest(BaseModel):
     length: str = Field(..., min_length=1, description="Length cannot be empty")
     characters: Optional[List[str]] = Field(default=[], description="Character names")
     background_noise: Optional[str] = Field(default="none", description="Background noise type")
+    seed: Optional[int] = Field(default=None, description="Seed for reproducible characters (derived from the request if omitted)")
+    lazy_audio: Optional[bool] = Field(default=False, description="Synthesize scene audio on first fetch instead of up front")
 
 
 class Character(BaseModel):
@@ -26,6 +28,7 @@ class Character(BaseModel):
 class Scene(BaseModel):
     """Model for individual story scenes"""
     text: str
+    sceneNumber: Optional[int] = None
     audioUrl: Optional[str] = ""
     backgroundNoiseUrl: Optional[str] = ""
 
@@ -36,6 +39,7 @@ class StoryResponse(BaseModel):
     story: List[Scene]
     characters: List[Character]
     introduction: str
+    missingAudio: List[int] = Field(default=[], description="Scene numbers whose audio was not ready")
     message: str = ""
 
 
@@ -56,6 +60,32 @@ class CleanupResponse(BaseModel):
     """Response model for cleanup operations"""
     success: bool
     message: str
+    jobId: Optional[str] = None
+
+
+class CleanupJobStatus(BaseModel):
+    """Status model for background cleanup jobs"""
+    jobId: str
+    status: str  # queued, running, completed, failed
+    total: int
+    removed: int
+    failed: int
+    progress: float
+    filesPerSecond: float
+    elapsedSeconds: float
+    error: Optional[str] = None
+
+
+class JobResponse(BaseModel):
+    """Response model for queued story generation jobs"""
+    jobId: str
+    status: str  # queued, running, completed, failed
+    attempts: int = 0
+    createdAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    result: Optional[StoryResponse] = None
+    error: Optional[str] = None
 
 
 # Story length configurations
@@ -3,19 +3,54 @@ Narrative Service for structured text-only story generation
 Handles different story lengths and narrative structures
 """
 
+import os
 from typing import List, Dict
 from services.audio_service import audio_service
+from utils.lru_cache import LRUCache
 
 
 class NarrativeService:
     """Service for generating structured text-only narratives"""
     
+    # Scene templates per structure type, formatted with prompt and style
+    SCENE_TEMPLATES = {
+        "introduction": "In the heart of a {style} realm, {prompt} awakens to discover their world has changed forever. The morning light reveals extraordinary possibilities that were hidden in the shadows of yesterday. As they step forward into this new reality, every sense comes alive with wonder and anticipation.",
+        "setting": "The {style} landscape stretches endlessly before {prompt}, a tapestry of breathtaking beauty and hidden mysteries. Ancient structures whisper secrets of forgotten times, while the very air hums with magical energy. Every corner holds the promise of adventure and discovery.",
+        "conflict": "A formidable challenge emerges before {prompt}, testing their resolve and courage in ways they never imagined. The stakes rise higher with each passing moment, forcing them to dig deep within themselves to find the strength to continue. Allies and enemies alike watch with bated breath.",
+        "rising_action": "The tension mounts as {prompt} encounters increasingly complex obstacles and unexpected allies. Each step forward reveals new layers of the {style} world's intricate design. The journey becomes more perilous yet more rewarding, pushing them toward their ultimate destiny.",
+        "climax": "The moment of truth arrives for {prompt}, where all their experiences, lessons, and growth culminate in a single defining moment. In this {style} tale, everything they've learned and endured leads to this pivotal confrontation that will determine their fate and the fate of their world.",
+        "resolution": "{prompt} discovers a path forward through the chaos, finding clarity and purpose in the midst of uncertainty. The conflicts that once seemed insurmountable begin to resolve, revealing new possibilities and hope for the future. Wisdom emerges from the trials endured.",
+        "conclusion": "{prompt}'s {style} adventure reaches its natural conclusion, but the echoes of their journey will resonate through time. The story's impact extends far beyond its final pages, inspiring others to embark on their own quests for truth, courage, and transformation.",
+        "character_development": "Through their {style} experiences, {prompt} undergoes profound transformation, discovering hidden strengths and confronting inner demons. Each challenge shapes their character, revealing depths of courage and compassion they never knew they possessed.",
+        "complications": "Unexpected twists and turns complicate {prompt}'s journey, adding layers of intrigue and suspense to their {style} story. New revelations challenge everything they thought they knew, forcing them to adapt and grow in ways they never anticipated.",
+        "falling_action": "The intensity begins to ease as {prompt} moves toward resolution in their {style} adventure. The storm of conflict gives way to moments of reflection and understanding, allowing them to process the profound changes they've undergone.",
+        "character_background": "The layers of {prompt}'s past unfold, revealing the experiences and choices that shaped them into who they are today. In this {style} world, their history becomes a key to understanding their present and future path.",
+        "setting_establishment": "The {style} environment becomes more defined and immersive, showing {prompt} the intricate details of the world they must navigate. Every element tells a story, from the ancient architecture to the mystical creatures that call this place home.",
+        "inciting_incident": "A pivotal event occurs that irrevocably changes {prompt}'s world, setting them on a {style} journey that will test their limits and transform their understanding of reality. Nothing will ever be the same again.",
+        "midpoint": "{prompt} reaches a crucial turning point in their {style} adventure, where everything they've learned and experienced converges. This moment of revelation changes the entire trajectory of their journey, opening new possibilities and challenges.",
+        "denouement": "The final threads of {prompt}'s {style} story are woven together with masterful precision, bringing closure to their journey while leaving room for new beginnings. Every loose end finds its place in the grand tapestry of their adventure.",
+        "continuation": "{prompt} continues their {style} journey, facing new challenges and discovering hidden truths about themselves and their world. Each step forward reveals new mysteries and opportunities for growth and adventure."
+    }
+    
     def __init__(self):
         self.length_configs = {
             "short": {"scenes": 10, "words_per_scene": 200},
             "medium": {"scenes": 20, "words_per_scene": 250},
             "long": {"scenes": 30, "words_per_scene": 300}
         }
+        
+        # Scene templates in story order for each length, resolved once
+        self.scene_plans = {
+            length: self._build_scene_plan(length)
+            for length in self.length_configs
+        }
+        
+        # Complete scene lists keyed by (prompt, style, length), bounded by text size
+        self.cache = LRUCache(
+            max_entries=int(os.getenv("NARRATIVE_CACHE_MAX_ENTRIES", "2048")),
+            max_bytes=int(os.getenv("NARRATIVE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            max_age=float(os.getenv("NARRATIVE_CACHE_MAX_AGE", "3600"))
+        )
     
     def generate_structured_narrative(self, prompt: str, style: str, length: str) -> List[Dict[str, str]]:
         """
@@ -28,29 +63,53 @@ class NarrativeService:
             
         Returns:
             List of scene dictionaries with text and image descriptions
+            
+        Narratives are deterministic, so complete scene lists are cached and
+        repeated prompts skip formatting entirely.
         """
-        config = self.length_configs.get(length, self.length_configs["medium"])
-        num_scenes = config["scenes"]
+        key = (prompt, style, length)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self._format_scenes(prompt, style, length)
+            size = sum(len(scene["text"].encode("utf-8")) + len(scene["imageDescription"].encode("utf-8")) for scene in cached)
+            self.cache.put(key, cached, size=size)
         
-        # Define narrative structure based on length
-        structure = self._get_narrative_structure(length)
+        # Callers own the returned scene dicts; the cached ones stay untouched
+        return [dict(scene) for scene in cached]
+    
+    def _format_scenes(self, prompt: str, style: str, length: str) -> List[Dict[str, str]]:
+        """Format the scene plan of a story length with prompt and style"""
+        plan = self.scene_plans.get(length) or self._build_scene_plan(length)
+        image_description = f"A {style} scene featuring {prompt} in a narrative context"
+        
+        # Only the template each scene uses is formatted
+        return [
+            {
+                "text": template.format(prompt=prompt, style=style),
+                "imageDescription": image_description
+            }
+            for template in plan
+        ]
+    
+    def _build_scene_plan(self, length: str) -> List[str]:
+        """
+        Resolve the scene template of every scene in a story
         
-        # Create structured scenes
-        scenes = []
-        for i in range(num_scenes):
-            if i < len(structure):
-                structure_type = structure[i]
-            else:
-                # For longer stories, use generic continuation
-                structure_type = "continuation"
-            scene_text = self._generate_scene_text(prompt, style, structure_type, i)
+        Args:
+            length: Story length (short, medium, long)
             
-            scenes.append({
-                "text": scene_text,
-                "imageDescription": f"A {style} scene featuring {prompt} in a narrative context"
-            })
+        Returns:
+            List of template strings, one per scene
+        """
+        config = self.length_configs.get(length, self.length_configs["medium"])
+        structure = self._get_narrative_structure(length)
         
-        return scenes
+        plan = []
+        for i in range(config["scenes"]):
+            # For longer stories, use generic continuation
+            structure_type = structure[i] if i < len(structure) else "continuation"
+            plan.append(self.SCENE_TEMPLATES.get(structure_type, self.SCENE_TEMPLATES["continuation"]))
+        return plan
     
     def _get_narrative_structure(self, length: str) -> List[str]:
         """Get narrative structure based on story length"""
@@ -73,30 +132,6 @@ class NarrativeService:
                 "falling_action_2", "resolution", "denouement", "conclusion"
             ]
     
-    def _generate_scene_text(self, prompt: str, style: str, structure_type: str, scene_index: int) -> str:
-        """Generate text for a specific scene based on structure type"""
-        scene_templates = {
-            "introduction": f"In the heart of a {style} realm, {prompt} awakens to discover their world has changed forever. The morning light reveals extraordinary possibilities that were hidden in the shadows of yesterday. As they step forward into this new reality, every sense comes alive with wonder and anticipation.",
-            "setting": f"The {style} landscape stretches endlessly before {prompt}, a tapestry of breathtaking beauty and hidden mysteries. Ancient structures whisper secrets of forgotten times, while the very air hums with magical energy. Every corner holds the promise of adventure and discovery.",
-            "conflict": f"A formidable challenge emerges before {prompt}, testing their resolve and courage in ways they never imagined. The stakes rise higher with each passing moment, forcing them to dig deep within themselves to find the strength to continue. Allies and enemies alike watch with bated breath.",
-            "rising_action": f"The tension mounts as {prompt} encounters increasingly complex obstacles and unexpected allies. Each step forward reveals new layers of the {style} world's intricate design. The journey becomes more perilous yet more rewarding, pushing them toward their ultimate destiny.",
-            "climax": f"The moment of truth arrives for {prompt}, where all their experiences, lessons, and growth culminate in a single defining moment. In this {style} tale, everything they've learned and endured leads to this pivotal confrontation that will determine their fate and the fate of their world.",
-            "resolution": f"{prompt} discovers a path forward through the chaos, finding clarity and purpose in the midst of uncertainty. The conflicts that once seemed insurmountable begin to resolve, revealing new possibilities and hope for the future. Wisdom emerges from the trials endured.",
-            "conclusion": f"{prompt}'s {style} adventure reaches its natural conclusion, but the echoes of their journey will resonate through time. The story's impact extends far beyond its final pages, inspiring others to embark on their own quests for truth, courage, and transformation.",
-            "character_development": f"Through their {style} experiences, {prompt} undergoes profound transformation, discovering hidden strengths and confronting inner demons. Each challenge shapes their character, revealing depths of courage and compassion they never knew they possessed.",
-            "complications": f"Unexpected twists and turns complicate {prompt}'s journey, adding layers of intrigue and suspense to their {style} story. New revelations challenge everything they thought they knew, forcing them to adapt and grow in ways they never anticipated.",
-            "falling_action": f"The intensity begins to ease as {prompt} moves toward resolution in their {style} adventure. The storm of conflict gives way to moments of reflection and understanding, allowing them to process the profound changes they've undergone.",
-            "character_background": f"The layers of {prompt}'s past unfold, revealing the experiences and choices that shaped them into who they are today. In this {style} world, their history becomes a key to understanding their present and future path.",
-            "setting_establishment": f"The {style} environment becomes more defined and immersive, showing {prompt} the intricate details of the world they must navigate. Every element tells a story, from the ancient architecture to the mystical creatures that call this place home.",
-            "inciting_incident": f"A pivotal event occurs that irrevocably changes {prompt}'s world, setting them on a {style} journey that will test their limits and transform their understanding of reality. Nothing will ever be the same again.",
-            "midpoint": f"{prompt} reaches a crucial turning point in their {style} adventure, where everything they've learned and experienced converges. This moment of revelation changes the entire trajectory of their journey, opening new possibilities and challenges.",
-            "denouement": f"The final threads of {prompt}'s {style} story are woven together with masterful precision, bringing closure to their journey while leaving room for new beginnings. Every loose end finds its place in the grand tapestry of their adventure."
-        }
-        
-        scene_templates["continuation"] = f"{prompt} continues their {style} journey, facing new challenges and discovering hidden truths about themselves and their world. Each step forward reveals new mysteries and opportunities for growth and adventure."
-        
-        return scene_templates.get(structure_type, f"{prompt} continues their {style} journey, facing new challenges and discovering hidden truths about themselves and their world. Each step forward reveals new mysteries and opportunities for growth and adventure.")
-    
     def get_available_lengths(self) -> List[str]:
         """Get list of available story lengths"""
         return list(self.length_configs.keys())
@@ -3,13 +3,26 @@ Story Service for managing different story types and lengths
 Handles story generation coordination and scene management
 """
 
+import os
+import json
+import time
+import uuid
+import random
+import hashlib
+import asyncio
+import threading
+import functools
 import concurrent.futures
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 from services.audio_service import audio_service
 from services.narrative_service import narrative_service
 from services.character_service import character_service
 from services.background_noise_service import background_noise_service
 from services.models import Character
+from utils.worker_pool import tts_pool
+from utils.lru_cache import LRUCache
+from utils.single_flight import SingleFlight
+from utils.shared_cache import SharedCache
 
 
 class StoryService:
@@ -20,8 +33,86 @@ class StoryService:
         self.narrative_service = narrative_service
         self.character_service = character_service
         self.background_noise_service = background_noise_service
+        self.tts_pool = tts_pool
+        
+        # Bounded pool that runs blocking story generation off the event loop
+        self.request_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=int(os.getenv("STORY_WORKERS", "8")),
+            thread_name_prefix="story"
+        )
+        
+        # Single wall-clock budget for all audio of one story request
+        self.audio_deadline = float(os.getenv("STORY_AUDIO_DEADLINE", "60"))
+        
+        # Complete responses of identical requests; entries expire well before
+        # the audio they reference can be collected
+        self.response_cache = LRUCache(
+            max_entries=int(os.getenv("STORY_CACHE_MAX_ENTRIES", "256")),
+            max_age=float(os.getenv("STORY_CACHE_MAX_AGE", "600"))
+        )
+        self._single_flight = SingleFlight()
+        
+        # Batch endpoint limits: stories per batch and stories generated at once
+        self.batch_max_stories = int(os.getenv("STORY_BATCH_MAX", "100"))
+        self.batch_concurrency = int(os.getenv("STORY_BATCH_CONCURRENCY", "4"))
+        
+        # Scene texts of lazy-audio stories by story id, shared by all server
+        # workers, and the scenes this process has prefetched per story
+        self.lazy_stories = SharedCache(
+            "lazy_stories",
+            max_entries=int(os.getenv("LAZY_STORY_MAX_ENTRIES", "10000")),
+            max_age=float(os.getenv("LAZY_STORY_MAX_AGE", "86400"))
+        )
+        self._lazy_prefetched = LRUCache(max_entries=int(os.getenv("LAZY_STORY_MAX_ENTRIES", "10000")))
+        self.lazy_prefetch = int(os.getenv("LAZY_AUDIO_PREFETCH", "2"))
+        self._lazy_lock = threading.Lock()
+    
+    def _story_key(self, prompt: str, style: str, length: str, characters: Optional[List[str]], background_noise: str, include_audio: bool, seed: Optional[int] = None, lazy_audio: bool = False) -> str:
+        """Build a content hash identifying a story request"""
+        payload = json.dumps({
+            "prompt": prompt,
+            "style": style,
+            "length": length,
+            "characters": list(characters or []),
+            "background_noise": background_noise,
+            "include_audio": include_audio,
+            "seed": seed,
+            "lazy_audio": lazy_audio
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
     
-    def generate_story(self, prompt: str, style: str, length: str, characters: List[str] = None, background_noise: str = "none", include_audio: bool = True) -> Dict:
+    def _request_rng(self, key: str, seed: Optional[int]) -> random.Random:
+        """
+        Create the random generator of one request
+        
+        Uses the client seed when given and otherwise derives one from the
+        request hash, so identical requests get identical characters.
+        """
+        return random.Random(seed if seed is not None else int(key[:16], 16))
+    
+    def _get_cached_story(self, key: str) -> Optional[Dict]:
+        """Get a cached response whose audio files are all still on disk"""
+        result = self.response_cache.get(key)
+        if result is None:
+            return None
+        for scene in result["story"]:
+            for url in (scene.get("audioUrl"), scene.get("backgroundNoiseUrl")):
+                # Lazy placeholders are API routes, not files
+                if url and url.startswith("/static/") and not os.path.exists(url.lstrip("/")):
+                    self.response_cache.pop(key)
+                    return None
+        return result
+    
+    def _copy_story(self, result: Dict) -> Dict:
+        """Copy a shared response so callers can modify it freely"""
+        return {
+            **result,
+            "story": [dict(scene) for scene in result["story"]],
+            "characters": [character.model_copy() for character in result["characters"]],
+            "missingAudio": list(result["missingAudio"])
+        }
+    
+    def generate_story(self, prompt: str, style: str, length: str, characters: List[str] = None, background_noise: str = "none", include_audio: bool = True, seed: Optional[int] = None, lazy_audio: bool = False) -> Dict:
         """
         Generate a complete story with scenes, characters, and optional audio
         
@@ -32,15 +123,48 @@ class StoryService:
             characters: List of character names
             background_noise: Type of background noise
             include_audio: Whether to generate audio for scenes
+            seed: Seed for character generation (derived from the request if None)
+            lazy_audio: Return placeholder audio URLs that synthesize on first fetch
             
         Returns:
             Dictionary with success status, story scenes, characters, introduction, and message
+            
+        Identical concurrent requests share one generation, and complete
+        responses are cached. Characters come from a seeded generator, so the
+        same request always produces the same response.
         """
+        key = self._story_key(prompt, style, length, characters, background_noise, include_audio, seed, lazy_audio)
+        cached = self._get_cached_story(key)
+        if cached is not None:
+            print(f"Story cache hit: {prompt}")
+            return self._copy_story(cached)
+        
+        result = self._single_flight.do(
+            key, self._generate_and_cache_story, key,
+            prompt, style, length, characters, background_noise, include_audio, self._request_rng(key, seed),
+            key if lazy_audio else None
+        )
+        return self._copy_story(result)
+    
+    def _generate_and_cache_story(self, key: str, *args) -> Dict:
+        """Generate a story and cache it if every scene is complete"""
+        # A previous leader may have finished between the cache check and now
+        cached = self._get_cached_story(key)
+        if cached is not None:
+            return cached
+        
+        result = self._generate_story_uncached(*args)
+        if result["success"] and not result["missingAudio"]:
+            self.response_cache.put(key, result)
+        return result
+    
+    def _generate_story_uncached(self, prompt: str, style: str, length: str, characters: List[str] = None, background_noise: str = "none", include_audio: bool = True, rng: Optional[random.Random] = None, lazy_story_id: Optional[str] = None) -> Dict:
+        """Run the character, narrative and audio pipeline for one story"""
         try:
             print(f"Generating {length} {style} story: {prompt}")
             
             # Generate characters
-            story_characters = self.character_service.generate_characters(prompt, style, characters)
+            story_characters = self.character_service.generate_characters(prompt, style, characters, rng)
             
             # Generate story introduction
             introduction = self.character_service.generate_story_introduction(prompt, style, story_characters)
@@ -48,19 +172,29 @@ class StoryService:
             # Generate structured narrative
             scenes_data = self.narrative_service.generate_structured_narrative(prompt, style, length)
             
-            if include_audio:
+            if include_audio and lazy_story_id:
+                # Placeholder URLs; audio is synthesized when first fetched
+                scenes = self._generate_lazy_scenes(lazy_story_id, scenes_data, background_noise)
+            elif include_audio:
                 # Generate audio and background noise for all scenes
-                scenes = self._generate_scenes_with_audio_and_noise(scenes_data, background_noise)
+                request_id = uuid.uuid4().hex
+                scenes = self._generate_scenes_with_audio_and_noise(scenes_data, background_noise, request_id)
             else:
                 # Generate scenes without audio
                 scenes = self._generate_scenes_without_audio(scenes_data)
             
+            missing_audio = [scene["sceneNumber"] for scene in scenes if include_audio and not scene["audioUrl"]]
+            message = f"Successfully generated {len(scenes)} scenes with {len(story_characters)} characters"
+            if missing_audio:
+                message += f" ({len(missing_audio)} scenes without audio)"
+            
             return {
                 "success": True,
                 "story": scenes,
                 "characters": story_characters,
                 "introduction": introduction,
-                "message": f"Successfully generated {len(scenes)} scenes with {len(story_characters)} characters"
+                "missingAudio": missing_audio,
+                "message": message
             }
             
         except Exception as e:
@@ -70,136 +204,553 @@ class StoryService:
                 "story": [],
                 "characters": [],
                 "introduction": "",
+                "missingAudio": [],
                 "message": f"Failed to generate story: {str(e)}"
             }
     
-    def _generate_scenes_with_audio(self, scenes_data: List[Dict[str, str]]) -> List[Dict[str, str]]:
-        """Generate scenes with audio using parallel processing"""
+    async def generate_story_async(self, *args, **kwargs) -> Dict:
+        """
+        Generate a story without blocking the asyncio event loop
+        
+        Runs generate_story on the bounded request executor so concurrent
+        requests overlap instead of queuing behind each other.
+        
+        Args:
+            Same as generate_story
+            
+        Returns:
+            Same as generate_story
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.request_executor,
+            functools.partial(self.generate_story, *args, **kwargs)
+        )
+    
+    def _generate_scenes_with_audio(self, scenes_data: List[Dict[str, str]], request_id: str = None) -> List[Dict[str, str]]:
+        """Generate scenes with audio using the shared TTS worker pool"""
+        request_id = request_id or uuid.uuid4().hex
         scenes = []
         
-        # Use ThreadPoolExecutor for parallel audio processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            # Submit all audio generation tasks
-            audio_futures = []
+        # Submit all audio generation tasks
+        audio_futures = []
+        
+        for i, scene_data in enumerate(scenes_data):
+            print(f"Processing scene {i+1}/{len(scenes_data)}...")
             
-            for i, scene_data in enumerate(scenes_data):
-                print(f"Processing scene {i+1}/{len(scenes_data)}...")
-                
-                # Submit audio generation task
-                audio_future = executor.submit(
-                    self.audio_service.generate_scene_audio, 
-                    scene_data["text"], 
-                    "woman",  # Default to woman's voice
-                    i
-                )
+            # Submit audio generation task
+            audio_future = self.tts_pool.submit(
+                request_id,
+                self.audio_service.generate_scene_audio, 
+                scene_data["text"], 
+                "woman",  # Default to woman's voice
+                i
+            )
+            audio_futures.append((i, audio_future))
+        
+        # Process audio results within one deadline for the whole request
+        audio_results = self._wait_for_audio(audio_futures, time.monotonic() + self.audio_deadline)
+        
+        # Create scenes with audio results
+        for i, scene_data in enumerate(scenes_data):
+            scene = {
+                "text": scene_data["text"],
+                "sceneNumber": i + 1,
+                "audioUrl": audio_results.get(i) or ""
+            }
+            scenes.append(scene)
+        
+        return scenes
+    
+    def _submit_scene_jobs(self, scenes_data: List[Dict[str, str]], background_noise: str, request_id: str):
+        """
+        Submit background noise and per-scene audio jobs to the shared TTS pool
+        
+        Returns:
+            Tuple of (noise future, list of (scene index, audio future))
+        """
+        # The background track is identical for every scene, so build it once
+        noise_future = self.tts_pool.submit(
+            request_id,
+            self.background_noise_service.generate_background_noise,
+            background_noise,
+            30  # 30 seconds duration
+        )
+        
+        if self.audio_service.batch_enabled("woman"):
+            return noise_future, self._submit_batched_scene_jobs(scenes_data, request_id)
+        
+        # Submit all audio tasks
+        audio_futures = []
+        
+        for i, scene_data in enumerate(scenes_data):
+            print(f"Processing scene {i+1}/{len(scenes_data)}...")
+            
+            # Scenes already in the TTS cache resolve without a pool round trip
+            cached_url = self.audio_service.get_cached_speech(scene_data["text"], "woman")
+            if cached_url:
+                audio_future = concurrent.futures.Future()
+                audio_future.set_result(cached_url)
                 audio_futures.append((i, audio_future))
+                continue
             
-            # Process audio results
-            audio_results = {}
-            for i, future in audio_futures:
+            # Submit audio generation task
+            audio_future = self.tts_pool.submit(
+                request_id,
+                self.audio_service.generate_scene_audio, 
+                scene_data["text"], 
+                "woman",  # Default to woman's voice
+                i
+            )
+            audio_futures.append((i, audio_future))
+        
+        return noise_future, audio_futures
+    
+    def _wait_for_audio(self, audio_futures: list, deadline: float) -> Dict[int, Optional[str]]:
+        """
+        Collect scene audio as it completes until the request deadline
+        
+        Work still outstanding at the deadline is cancelled and its scenes are
+        left without audio, so one stuck TTS call cannot hold the response.
+        
+        Args:
+            audio_futures: List of (scene index, audio future)
+            deadline: time.monotonic() value after which waiting stops
+            
+        Returns:
+            Dictionary mapping scene index to audio URL (None if missing)
+        """
+        index_by_future = {future: i for i, future in audio_futures}
+        audio_results = {i: None for i, _ in audio_futures}
+        
+        try:
+            for future in concurrent.futures.as_completed(index_by_future, timeout=max(0.0, deadline - time.monotonic())):
+                i = index_by_future[future]
                 try:
-                    audio_url = future.result(timeout=30)
-                    audio_results[i] = audio_url
+                    audio_results[i] = future.result()
                     print(f"Audio {i+1} generated successfully")
                 except Exception as e:
                     print(f"Failed to generate audio {i+1}: {e}")
-                    audio_results[i] = None
+        except concurrent.futures.TimeoutError:
+            pending = [future for future in index_by_future if not future.done()]
+            for future in pending:
+                future.cancel()
+            print(f"Audio deadline reached, {len(pending)} scenes left without audio")
+        
+        return audio_results
+    
+    def _submit_batched_scene_jobs(self, scenes_data: List[Dict[str, str]], request_id: str) -> list:
+        """
+        Submit scene audio as batched TTS jobs of audio_service.batch_size scenes
+        
+        Each batch is rendered by one engine call on one pool thread, so this
+        suits CPU-bound local engines rather than network engines.
+        
+        Returns:
+            List of (scene index, audio future); each future resolves when
+            its batch has been written
+        """
+        audio_futures = [(i, concurrent.futures.Future()) for i in range(len(scenes_data))]
+        batch_size = self.audio_service.batch_size
+        
+        for start in range(0, len(scenes_data), batch_size):
+            batch = audio_futures[start:start + batch_size]
+            print(f"Processing scenes {start+1}-{start+len(batch)}/{len(scenes_data)} as one batch...")
             
-            # Create scenes with audio results
-            for i, scene_data in enumerate(scenes_data):
-                scene = {
-                    "text": scene_data["text"],
-                    "audioUrl": audio_results.get(i) or ""
-                }
-                scenes.append(scene)
+            def resolve(offset: int, audio_url: Optional[str], batch=batch):
+                future = batch[offset][1]
+                if future.set_running_or_notify_cancel():
+                    future.set_result(audio_url)
+            
+            def fail_unresolved(job: concurrent.futures.Future, batch=batch):
+                if job.cancelled() or job.exception() is None:
+                    return
+                for _, future in batch:
+                    if not future.done() and future.set_running_or_notify_cancel():
+                        future.set_exception(job.exception())
+            
+            job = self.tts_pool.submit(
+                request_id,
+                self.audio_service.generate_batch_speech,
+                [scenes_data[i]["text"] for i, _ in batch],
+                "woman",  # Default to woman's voice
+                resolve
+            )
+            job.add_done_callback(fail_unresolved)
         
-        return scenes
+        return audio_futures
+    
+    def _collect_noise(self, noise_future: concurrent.futures.Future, deadline: float) -> Optional[str]:
+        """Wait for the shared background noise track until the request deadline"""
+        try:
+            noise_url = noise_future.result(timeout=max(0.0, deadline - time.monotonic()))
+            if noise_url:
+                print("Background noise generated successfully")
+            return noise_url
+        except Exception as e:
+            print(f"Failed to generate background noise: {e}")
+            return None
     
-    def _generate_scenes_with_audio_and_noise(self, scenes_data: List[Dict[str, str]], background_noise: str) -> List[Dict[str, str]]:
-        """Generate scenes with audio and background noise using parallel processing"""
+    def _generate_scenes_with_audio_and_noise(self, scenes_data: List[Dict[str, str]], background_noise: str, request_id: str = None) -> List[Dict[str, str]]:
+        """Generate scenes with audio and background noise using the shared TTS worker pool"""
+        request_id = request_id or uuid.uuid4().hex
         scenes = []
         
-        # Use ThreadPoolExecutor for parallel processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            # Submit all tasks
-            audio_futures = []
-            noise_futures = []
+        noise_future, audio_futures = self._submit_scene_jobs(scenes_data, background_noise, request_id)
+        
+        deadline = time.monotonic() + self.audio_deadline
+        
+        # Process audio results within one deadline for the whole request
+        audio_results = self._wait_for_audio(audio_futures, deadline)
+        
+        # Process background noise result
+        noise_url = self._collect_noise(noise_future, deadline)
+        
+        # Create scenes with results
+        for i, scene_data in enumerate(scenes_data):
+            scene = {
+                "text": scene_data["text"],
+                "sceneNumber": i + 1,
+                "audioUrl": audio_results.get(i) or "",
+                "backgroundNoiseUrl": noise_url or ""
+            }
+            scenes.append(scene)
+        
+        return scenes
+    
+    def generate_story_stream(self, prompt: str, style: str, length: str, characters: List[str] = None, background_noise: str = "none", seed: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Generate a story as a stream of events
+        
+        Yields a "story" event with the characters and introduction first, then
+        one "scene" event per scene in order as soon as its audio is ready, and
+        finally a "done" event (or an "error" event if generation fails).
+        Scenes never wait for the background noise track: one "background"
+        event carries its URL as soon as it is ready (at the latest before
+        "done"), and every scene after it carries the URL as well.
+        
+        Args:
+            prompt: User's story idea
+            style: Story style/genre
+            length: Story length (short, medium, long)
+            characters: List of character names
+            background_noise: Type of background noise
+            seed: Seed for character generation (derived from the request if None)
+            
+        Yields:
+            Event dictionaries with a "type" key
+        """
+        audio_futures = []
+        noise_future = None
+        try:
+            print(f"Streaming {length} {style} story: {prompt}")
+            
+            key = self._story_key(prompt, style, length, characters, background_noise, True, seed)
+            story_characters = self.character_service.generate_characters(prompt, style, characters, self._request_rng(key, seed))
+            introduction = self.character_service.generate_story_introduction(prompt, style, story_characters)
+            scenes_data = self.narrative_service.generate_structured_narrative(prompt, style, length)
+            
+            request_id = uuid.uuid4().hex
+            noise_future, audio_futures = self._submit_scene_jobs(scenes_data, background_noise, request_id)
+            
+            yield {
+                "type": "story",
+                "characters": [character.model_dump() for character in story_characters],
+                "introduction": introduction,
+                "totalScenes": len(scenes_data)
+            }
+            
+            deadline = time.monotonic() + self.audio_deadline
+            noise_url = None
+            noise_sent = False
+            missing_audio = []
             
-            for i, scene_data in enumerate(scenes_data):
-                print(f"Processing scene {i+1}/{len(scenes_data)}...")
-                
-                # Submit audio generation task
-                audio_future = executor.submit(
-                    self.audio_service.generate_scene_audio, 
-                    scene_data["text"], 
-                    "woman",  # Default to woman's voice
-                    i
-                )
-                audio_futures.append((i, audio_future))
-                
-                # Submit background noise generation task
-                noise_future = executor.submit(
-                    self.background_noise_service.generate_background_noise,
-                    background_noise,
-                    30  # 30 seconds duration
-                )
-                noise_futures.append((i, noise_future))
-            
-            # Process audio results
-            audio_results = {}
             for i, future in audio_futures:
                 try:
-                    audio_url = future.result(timeout=30)
-                    audio_results[i] = audio_url
+                    audio_url = future.result(timeout=max(0.0, deadline - time.monotonic()))
                     print(f"Audio {i+1} generated successfully")
+                except concurrent.futures.TimeoutError:
+                    print(f"Audio deadline reached before scene {i+1}")
+                    future.cancel()
+                    audio_url = None
                 except Exception as e:
                     print(f"Failed to generate audio {i+1}: {e}")
-                    audio_results[i] = None
-            
-            # Process background noise results
-            noise_results = {}
-            for i, future in noise_futures:
-                try:
-                    noise_url = future.result(timeout=30)
-                    noise_results[i] = noise_url
-                    print(f"Background noise {i+1} generated successfully")
-                except Exception as e:
-                    print(f"Failed to generate background noise {i+1}: {e}")
-                    noise_results[i] = None
-            
-            # Create scenes with results
-            for i, scene_data in enumerate(scenes_data):
-                scene = {
-                    "text": scene_data["text"],
-                    "audioUrl": audio_results.get(i) or "",
-                    "backgroundNoiseUrl": noise_results.get(i) or ""
+                    audio_url = None
+                
+                if not audio_url:
+                    missing_audio.append(i + 1)
+                
+                if not noise_sent and noise_future.done():
+                    noise_url = self._collect_noise(noise_future, deadline)
+                    noise_sent = True
+                    yield {"type": "background", "backgroundNoiseUrl": noise_url or ""}
+                
+                yield {
+                    "type": "scene",
+                    "scene": {
+                        "text": scenes_data[i]["text"],
+                        "sceneNumber": i + 1,
+                        "audioUrl": audio_url or "",
+                        "backgroundNoiseUrl": noise_url or ""
+                    }
                 }
-                scenes.append(scene)
+            
+            if not noise_sent:
+                noise_url = self._collect_noise(noise_future, deadline)
+                yield {"type": "background", "backgroundNoiseUrl": noise_url or ""}
+            
+            yield {
+                "type": "done",
+                "missingAudio": missing_audio,
+                "message": f"Successfully generated {len(scenes_data)} scenes with {len(story_characters)} characters"
+            }
+            
+        except Exception as e:
+            print(f"Error streaming story: {e}")
+            yield {"type": "error", "message": f"Failed to generate story: {str(e)}"}
+        finally:
+            # Client went away or generation failed - drop work nobody will read
+            for _, future in audio_futures:
+                future.cancel()
+            if noise_future is not None:
+                noise_future.cancel()
+    
+    def generate_stories_stream(self, story_requests: List[Dict]) -> Iterator[Dict]:
+        """
+        Generate a batch of stories and yield each one as soon as it is done
+        
+        Identical requests are generated once. Distinct stories still share
+        work through the narrative, TTS and background noise caches, and all
+        TTS jobs run on the shared worker pool. At most batch_concurrency
+        stories are generated at a time so a large batch cannot take over the
+        request executor.
         
+        Args:
+            story_requests: List of generate_story keyword arguments (prompt,
+                style, length, and optionally characters, background_noise, seed,
+                lazy_audio)
+            
+        Yields:
+            One {"type": "result", "index": i, "result": story} event per
+            request, in completion order, then a final {"type": "stats"} event.
+            Story and scene counts cover this batch only; processTtsJobs and
+            processTtsCacheHits are process-wide TTS counters over the batch's
+            run and include any concurrent traffic.
+        """
+        start = time.perf_counter()
+        pool_before = self.tts_pool.stats()["submitted"]
+        cache_before = self.audio_service.cache.stats()["hits"]
+        
+        # Request indexes per unique story
+        indexes_by_key = {}
+        unique_requests = []
+        for i, story_request in enumerate(story_requests):
+            key = self._story_key(
+                story_request["prompt"], story_request["style"], story_request["length"],
+                story_request.get("characters"), story_request.get("background_noise", "none"),
+                True, story_request.get("seed"), story_request.get("lazy_audio", False)
+            )
+            if key not in indexes_by_key:
+                indexes_by_key[key] = []
+                unique_requests.append((key, story_request))
+            indexes_by_key[key].append(i)
+        
+        pending = {}
+        remaining = iter(unique_requests)
+        
+        def submit_next():
+            item = next(remaining, None)
+            if item is not None:
+                key, story_request = item
+                pending[self.request_executor.submit(self.generate_story, **story_request)] = key
+        
+        stories = scenes = scenes_with_audio = failed = 0
+        try:
+            for _ in range(self.batch_concurrency):
+                submit_next()
+            
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    result = future.result()
+                    submit_next()
+                    
+                    for i in indexes_by_key[key]:
+                        stories += 1
+                        if not result["success"]:
+                            failed += 1
+                        scenes += len(result["story"])
+                        scenes_with_audio += sum(1 for scene in result["story"] if scene.get("audioUrl"))
+                        yield {"type": "result", "index": i, "result": self._copy_story(result)}
+        finally:
+            # Client went away - drop stories that have not started
+            for future in pending:
+                future.cancel()
+        
+        elapsed = time.perf_counter() - start
+        yield {
+            "type": "stats",
+            "stats": {
+                "stories": stories,
+                "uniqueStories": len(unique_requests),
+                "failedStories": failed,
+                "scenes": scenes,
+                "scenesWithAudio": scenes_with_audio,
+                "processTtsJobs": self.tts_pool.stats()["submitted"] - pool_before,
+                "processTtsCacheHits": self.audio_service.cache.stats()["hits"] - cache_before,
+                "elapsedSeconds": elapsed,
+                "storiesPerSecond": stories / elapsed if elapsed > 0 else 0.0,
+                "scenesPerSecond": scenes / elapsed if elapsed > 0 else 0.0
+            }
+        }
+    
+    def _generate_lazy_scenes(self, story_id: str, scenes_data: List[Dict[str, str]], background_noise: str) -> List[Dict[str, str]]:
+        """
+        Register a lazy-audio story and build scenes with placeholder URLs
+        
+        Placeholders are stable for identical requests because the story id
+        is the request hash. The story is stored in the shared database, so
+        any server worker can resolve its placeholders.
+        """
+        texts = [scene_data["text"] for scene_data in scenes_data]
+        entry = {
+            "texts": texts,
+            "voice": "woman",  # Default to woman's voice
+            "background_noise": background_noise
+        }
+        self.lazy_stories.put(story_id, entry)
+        
+        has_noise = background_noise in self.background_noise_service.get_available_noise_types() and background_noise != "none"
+        scenes = []
+        for i, scene_data in enumerate(scenes_data):
+            scene = {
+                "text": scene_data["text"],
+                "sceneNumber": i + 1,
+                "audioUrl": f"/api/story-audio/{story_id}/scenes/{i + 1}",
+                "backgroundNoiseUrl": f"/api/story-audio/{story_id}/background" if has_noise else ""
+            }
+            scenes.append(scene)
         return scenes
     
+    def get_lazy_scene_audio(self, story_id: str, scene_number: int) -> Optional[str]:
+        """
+        Get the audio of one scene of a lazy-audio story, synthesizing it if needed
+        
+        Concurrent fetches of the same scene share one synthesis through the
+        audio service. After the requested scene, the next lazy_prefetch
+        scenes are queued on the shared TTS pool so sequential playback finds
+        them ready.
+        
+        Args:
+            story_id: Story id from the placeholder URL
+            scene_number: 1-based scene number
+            
+        Returns:
+            Audio URL or None if synthesis failed
+            
+        Raises:
+            LookupError: If the story expired or the scene does not exist
+        """
+        entry = self.lazy_stories.get(story_id)
+        if entry is None or not 1 <= scene_number <= len(entry["texts"]):
+            raise LookupError(f"Unknown scene {scene_number} of story {story_id}")
+        texts, voice = entry["texts"], entry["voice"]
+        
+        # Queue the requested scene ahead of the prefetches in the story's fair-share group
+        text = texts[scene_number - 1]
+        audio_url = self.audio_service.get_cached_speech(text, voice)
+        future = None
+        if not audio_url:
+            future = self.tts_pool.submit(story_id, self.audio_service.generate_speech, text, voice)
+        
+        # Then the following scenes, so sequential playback finds them ready
+        with self._lazy_lock:
+            prefetched = self._lazy_prefetched.get(story_id)
+            if prefetched is None:
+                prefetched = set()
+                self._lazy_prefetched.put(story_id, prefetched)
+            prefetch = [i for i in range(scene_number, min(scene_number + self.lazy_prefetch, len(texts))) if i not in prefetched]
+            prefetched.update(prefetch)
+        for i in prefetch:
+            self.tts_pool.submit(story_id, self.audio_service.generate_speech, texts[i], voice)
+        
+        if future is None:
+            return audio_url
+        try:
+            return future.result(timeout=self.audio_deadline)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            print(f"Audio deadline reached for scene {scene_number} of story {story_id}")
+            return None
+    
+    def get_lazy_background_audio(self, story_id: str) -> Optional[str]:
+        """
+        Get the background noise track of a lazy-audio story
+        
+        Raises:
+            LookupError: If the story expired
+        """
+        entry = self.lazy_stories.get(story_id)
+        if entry is None:
+            raise LookupError(f"Unknown story {story_id}")
+        future = self.tts_pool.submit(
+            story_id,
+            self.background_noise_service.generate_background_noise,
+            entry["background_noise"],
+            30  # 30 seconds duration
+        )
+        try:
+            return future.result(timeout=self.audio_deadline)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return None
+    
     def _generate_scenes_without_audio(self, scenes_data: List[Dict[str, str]]) -> List[Dict[str, str]]:
         """Generate scenes without audio"""
         scenes = []
-        for scene_data in scenes_data:
+        for i, scene_data in enumerate(scenes_data):
             scene = {
                 "text": scene_data["text"],
+                "sceneNumber": i + 1,
                 "audioUrl": ""
             }
             scenes.append(scene)
         return scenes
     
-    def generate_full_story_audio(self, story_text: str, voice: str = "woman") -> Optional[str]:
+    def generate_full_story_audio(self, story_text: str, voice: str = "woman", scene_texts: Optional[List[str]] = None) -> Optional[str]:
         """
         Generate audio for the entire story
         
+        When the scene texts are given, the full track is spliced from the
+        per-scene audio files: only scenes missing from the TTS cache are
+        synthesized. Otherwise (or if splicing fails) the whole story text
+        is synthesized as one job.
+        
         Args:
             story_text: Complete story text
             voice: Voice type to use
+            scene_texts: Texts of the story's scenes in order
             
         Returns:
             Audio file path or None if failed
         """
+        if scene_texts:
+            request_id = uuid.uuid4().hex
+            audio_futures = [
+                (i, self.tts_pool.submit(request_id, self.audio_service.generate_speech, text, voice))
+                for i, text in enumerate(scene_texts)
+                if not self.audio_service.get_cached_speech(text, voice)
+            ]
+            if audio_futures:
+                print(f"Synthesizing {len(audio_futures)} of {len(scene_texts)} scenes for the full story")
+            self._wait_for_audio(audio_futures, time.monotonic() + self.audio_deadline)
+            
+            audio_url = self.audio_service.concatenate_speech(scene_texts, voice)
+            if audio_url:
+                return audio_url
+            print("Could not splice scene audio, synthesizing the full story")
+        
         return self.audio_service.generate_speech(story_text, voice)
     
     def get_available_styles(self) -> List[str]:
@@ -0,0 +1,207 @@
+"""
+TTS Client Service for talking to the Google TTS backend
+Keeps pooled keep-alive HTTP sessions shared by all audio services
+"""
+
+import os
+import re
+import json
+import base64
+import threading
+import urllib.parse
+import urllib.request
+from typing import Dict, Iterator, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from gtts import gTTS, gTTSError
+
+
+class TTSClient:
+    """HTTP client for gTTS requests with per-thread pooled sessions and retries"""
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        retries: int = 2,
+        backoff: float = 0.5,
+        timeout: Optional[float] = 15.0,
+        base_url: Optional[str] = None,
+        reuse_sessions: bool = True
+    ):
+        """
+        Args:
+            pool_size: Keep-alive connections kept per host and worker thread
+            retries: Retries for connection errors and 429/5xx responses
+            backoff: Exponential backoff factor between retries, in seconds
+            timeout: Per-request timeout in seconds
+            base_url: Override for the TTS host (e.g. a local stub server)
+            reuse_sessions: Keep one session per thread; False opens a session per request
+        """
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.base_url = base_url
+        self.reuse_sessions = reuse_sessions
+        self._local = threading.local()
+
+    def _new_session(self) -> requests.Session:
+        """Create a session with a pooled, retrying adapter"""
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def session(self) -> requests.Session:
+        """Get the keep-alive session of the calling worker thread"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    def _rewrite_url(self, url: str) -> str:
+        """Point a gTTS request at base_url when one is configured"""
+        if not self.base_url:
+            return url
+        target = urllib.parse.urlsplit(self.base_url)
+        original = urllib.parse.urlsplit(url)
+        return urllib.parse.urlunsplit((target.scheme, target.netloc, original.path, original.query, ""))
+
+    def stream(self, tts: gTTS) -> Iterator[bytes]:
+        """
+        Send the requests of a gTTS object and stream the audio
+
+        Args:
+            tts: Configured gTTS object
+
+        Yields:
+            Decoded MP3 bytes, one segment per gTTS text part
+        """
+        for prepared in tts._prepare_requests():
+            prepared.url = self._rewrite_url(prepared.url)
+            session = self.session() if self.reuse_sessions else self._new_session()
+            try:
+                try:
+                    response = session.send(
+                        prepared,
+                        proxies=urllib.request.getproxies(),
+                        timeout=tts.timeout or self.timeout,
+                        stream=True
+                    )
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError:
+                    raise gTTSError(tts=tts, response=response)
+                except requests.exceptions.RequestException:
+                    raise gTTSError(tts=tts)
+
+                # Decode line by line so only one part is held in memory
+                with response:
+                    for line in response.iter_lines(chunk_size=8192):
+                        decoded_line = line.decode("utf-8")
+                        if tts.GOOGLE_TTS_RPC in decoded_line:
+                            audio_search = re.search(r'jQ1olc","\[\\"(.*)\\"]', decoded_line)
+                            if not audio_search:
+                                raise gTTSError(tts=tts, response=response)
+                            yield base64.b64decode(audio_search.group(1).encode("ascii"))
+            finally:
+                if not self.reuse_sessions:
+                    session.close()
+
+    def _send(self, tts: gTTS, prepared: requests.PreparedRequest) -> requests.Response:
+        """Send one prepared request on the calling thread's session and read the response"""
+        session = self.session() if self.reuse_sessions else self._new_session()
+        try:
+            response = session.send(
+                prepared,
+                proxies=urllib.request.getproxies(),
+                timeout=tts.timeout or self.timeout
+            )
+            response.raise_for_status()
+            return response
+        except requests.exceptions.HTTPError:
+            raise gTTSError(tts=tts, response=response)
+        except requests.exceptions.RequestException:
+            raise gTTSError(tts=tts)
+        finally:
+            if not self.reuse_sessions:
+                session.close()
+
+    def synthesize_batch(self, ttses: List[gTTS]) -> List[List[bytes]]:
+        """
+        Synthesize several gTTS objects with one batchexecute request
+
+        Every text part of every object becomes one RPC of a single request,
+        numbered so the answers can be matched back to their part. All
+        objects must share the same host (tld).
+
+        Args:
+            ttses: Configured gTTS objects
+
+        Returns:
+            Decoded MP3 segments of each object, in order
+
+        Raises:
+            gTTSError: If the request fails or an answer is missing
+        """
+        rpcs, owners = [], []
+        url, headers = None, None
+        for n, tts in enumerate(ttses):
+            for prepared in tts._prepare_requests():
+                # Reuse gTTS's own RPC packaging, renumbered from "generic" to the RPC index
+                f_req = urllib.parse.parse_qs(prepared.body)["f.req"][0]
+                rpc = json.loads(f_req)[0][0]
+                rpc[3] = str(len(rpcs) + 1)
+                rpcs.append(rpc)
+                owners.append(n)
+                url, headers = self._rewrite_url(prepared.url), prepared.headers
+
+        prepared = requests.Request(
+            method="POST",
+            url=url,
+            data="f.req={}&".format(urllib.parse.quote(json.dumps([rpcs], separators=(",", ":")))),
+            headers=headers
+        ).prepare()
+        response = self._send(ttses[0], prepared)
+
+        audio: Dict[str, bytes] = {}
+        for line in response.text.splitlines():
+            if ttses[0].GOOGLE_TTS_RPC not in line:
+                continue
+            try:
+                envelopes = json.loads(line)
+            except ValueError:
+                continue
+            for envelope in envelopes:
+                if envelope[:2] == ["wrb.fr", ttses[0].GOOGLE_TTS_RPC] and envelope[2]:
+                    audio[envelope[6]] = base64.b64decode(json.loads(envelope[2])[0])
+
+        segments: List[List[bytes]] = [[] for _ in ttses]
+        for rpc, owner in zip(rpcs, owners):
+            if rpc[3] not in audio:
+                raise gTTSError(tts=ttses[owner], response=response)
+            segments[owner].append(audio[rpc[3]])
+        return segments
+
+    def write_to_fp(self, tts: gTTS, fp):
+        """Synthesize a gTTS object and write the MP3 to a file-like object"""
+        for segment in self.stream(tts):
+            fp.write(segment)
+
+
+# Global TTS client shared by the audio and background noise services
+tts_client = TTSClient(
+    pool_size=int(os.getenv("TTS_POOL_SIZE", "4")),
+    retries=int(os.getenv("TTS_RETRIES", "2")),
+    backoff=float(os.getenv("TTS_BACKOFF", "0.5")),
+    timeout=float(os.getenv("TTS_TIMEOUT", "15")),
+    base_url=os.getenv("TTS_BASE_URL") or None
+)
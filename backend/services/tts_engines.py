@@ -0,0 +1,303 @@
+"""
+TTS Engines Service for pluggable speech synthesis backends
+Maps voices to engines: Google TTS over the network, offline espeak-ng, or a benchmark tone synthesizer
+"""
+
+import os
+import sys
+import math
+import wave
+import shutil
+import random
+import tempfile
+import threading
+import subprocess
+from array import array
+from typing import Dict, List
+from gtts import gTTS, gTTSError
+from services.tts_client import tts_client
+
+
+class TTSEngine:
+    """Base class for speech synthesis engines"""
+
+    name = "base"
+    extension = "mp3"
+    media_type = "audio/mpeg"
+    supports_batch = False
+
+    def available(self) -> bool:
+        """Whether the engine can run on this machine"""
+        return True
+
+    def synthesize(self, text: str, fp, **params):
+        """
+        Synthesize text and write the encoded audio to a binary file-like object
+
+        Args:
+            text: Text to speak
+            fp: Writable binary file-like object
+            **params: Engine-specific voice parameters
+        """
+        raise NotImplementedError
+
+    def synthesize_batch(self, texts: List[str], fps: list, **params):
+        """
+        Synthesize several texts in one pass, writing each to its own file
+
+        Only available when supports_batch is True.
+
+        Args:
+            texts: Texts to speak
+            fps: Writable binary file-like objects, one per text
+            **params: Engine-specific voice parameters
+        """
+        raise NotImplementedError
+
+
+class GTTSEngine(TTSEngine):
+    """Google Translate TTS over the shared pooled HTTP client"""
+
+    name = "gtts"
+    extension = "mp3"
+    media_type = "audio/mpeg"
+    supports_batch = True
+
+    def synthesize(self, text: str, fp, lang: str = "en", tld: str = "com", slow: bool = False):
+        tts = gTTS(text=text, lang=lang, tld=tld, slow=slow)
+        tts_client.write_to_fp(tts, fp)
+
+    def synthesize_batch(self, texts: List[str], fps: list, lang: str = "en", tld: str = "com", slow: bool = False):
+        """
+        Send every text of the batch in one batchexecute request
+
+        Each text gets exactly the MP3 parts it would get on its own. If the
+        backend rejects the combined request, the texts are sent one by one
+        instead, so a batch never fails where single requests would succeed.
+        """
+        ttses = [gTTS(text=text, lang=lang, tld=tld, slow=slow) for text in texts]
+        try:
+            segments = tts_client.synthesize_batch(ttses)
+        except gTTSError as e:
+            print(f"⚠️  Batched gTTS request failed ({e}), sending {len(texts)} texts one by one")
+            for tts, fp in zip(ttses, fps):
+                tts_client.write_to_fp(tts, fp)
+            return
+        for parts, fp in zip(segments, fps):
+            for part in parts:
+                fp.write(part)
+
+
+class EspeakEngine(TTSEngine):
+    """
+    Offline speech through the espeak-ng command line synthesizer
+
+    espeak-ng applies real pronunciation rules, so this is the engine for
+    air-gapped deployments. It runs as a subprocess per call; the binary
+    (ESPEAK_PATH, default espeak-ng) must be installed.
+    """
+
+    name = "espeak"
+    extension = "wav"
+    media_type = "audio/wav"
+
+    def __init__(self):
+        self.binary = os.getenv("ESPEAK_PATH", "espeak-ng")
+
+    def available(self) -> bool:
+        """Whether the espeak-ng binary can be found"""
+        return shutil.which(self.binary) is not None
+
+    def synthesize(self, text: str, fp, voice: str = "en-us", pitch: int = 50, speed: int = 160):
+        # espeak-ng only writes correct WAV sizes to a seekable file, not to a pipe
+        fd, temp_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            subprocess.run(
+                [self.binary, "-v", voice, "-p", str(pitch), "-s", str(speed), "-w", temp_path, "--stdin"],
+                input=text.encode("utf-8"),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=True,
+                timeout=60
+            )
+            with open(temp_path, "rb") as f:
+                shutil.copyfileobj(f, fp)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"espeak-ng failed: {e.stderr.decode('utf-8', 'replace').strip()}") from e
+        finally:
+            os.remove(temp_path)
+
+
+class FormantEngine(TTSEngine):
+    """
+    Tone synthesizer for benchmarks and tests
+
+    Not intelligible speech: there are no pronunciation rules, each letter
+    is a fixed short vowel-like tone (harmonics shaped by formant
+    resonances), noise burst or pause. It produces deterministic audio of
+    realistic length with no network and no system dependencies, which is
+    what benchmarks and tests need. Use the espeak engine for real offline
+    narration. Rendered segments are cached per (symbol, pitch, rate).
+    """
+
+    name = "formant"
+    extension = "wav"
+    media_type = "audio/wav"
+    supports_batch = True
+
+    SAMPLE_RATE = 16000
+    VOWEL_FORMANTS = {
+        "a": (730, 1090, 2440),
+        "e": (530, 1840, 2480),
+        "i": (270, 2290, 3010),
+        "o": (570, 840, 2410),
+        "u": (300, 870, 2240),
+        "y": (270, 2290, 3010)
+    }
+    VOICED_CONSONANTS = set("bdgjlmnrvwz")
+    PAUSES = {" ": 0.06, ",": 0.15, ";": 0.15, ":": 0.15, ".": 0.3, "!": 0.3, "?": 0.3, "\n": 0.3}
+
+    def __init__(self):
+        self._segments: Dict[tuple, bytes] = {}
+        self._lock = threading.Lock()
+
+    def synthesize(self, text: str, fp, pitch: float = 200.0, rate: float = 1.0):
+        self.synthesize_batch([text], [fp], pitch, rate)
+
+    def synthesize_batch(self, texts: List[str], fps: list, pitch: float = 200.0, rate: float = 1.0):
+        """
+        Render all texts into one PCM stream and cut it into one WAV per text
+
+        The offset where each text starts is recorded while rendering, so
+        the stream is split at exact text boundaries.
+        """
+        stream = bytearray()
+        offsets = []
+        for text in texts:
+            offsets.append(len(stream))
+            for symbol in self._symbols(text):
+                stream += self._segment(symbol, pitch, rate)
+        offsets.append(len(stream))
+
+        pcm = memoryview(stream)
+        for fp, start, end in zip(fps, offsets, offsets[1:]):
+            with wave.open(fp, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.SAMPLE_RATE)
+                wav.setnframes((end - start) // 2)
+                wav.writeframesraw(pcm[start:end])
+
+    def _symbols(self, text: str) -> List[str]:
+        """Reduce text to the symbols the synthesizer knows"""
+        symbols = []
+        for char in text.lower():
+            if char.isalpha() or char in self.PAUSES:
+                symbols.append(char if char.isascii() else "a")
+            elif char.isdigit():
+                symbols.append("o")
+        return symbols
+
+    def _segment(self, symbol: str, pitch: float, rate: float) -> bytes:
+        """Get the cached 16-bit PCM rendering of one symbol"""
+        key = (symbol, pitch, rate)
+        segment = self._segments.get(key)
+        if segment is None:
+            segment = self._render(symbol, pitch, rate)
+            with self._lock:
+                self._segments[key] = segment
+        return segment
+
+    def _render(self, symbol: str, pitch: float, rate: float) -> bytes:
+        """Render one symbol to 16-bit little-endian PCM"""
+        if symbol in self.PAUSES:
+            return b"\x00\x00" * int(self.SAMPLE_RATE * self.PAUSES[symbol] / rate)
+
+        if symbol in self.VOWEL_FORMANTS:
+            duration, formants, noise, gain = 0.09, self.VOWEL_FORMANTS[symbol], 0.0, 0.6
+        elif symbol in self.VOICED_CONSONANTS:
+            duration, formants, noise, gain = 0.05, (250, 1200, 2400), 0.2, 0.3
+        else:
+            duration, formants, noise, gain = 0.05, (2500, 4500, 6000), 1.0, 0.15
+
+        count = int(self.SAMPLE_RATE * duration / rate)
+        nyquist = self.SAMPLE_RATE / 2
+
+        # Harmonic amplitudes shaped by resonance peaks at the formant frequencies
+        harmonics = []
+        frequency = pitch
+        while frequency < nyquist:
+            amplitude = sum(1.0 / (1.0 + ((frequency - f) / 90.0) ** 2) for f in formants)
+            harmonics.append((2 * math.pi * frequency / self.SAMPLE_RATE, amplitude))
+            frequency += pitch
+        peak = sum(amplitude for _, amplitude in harmonics) or 1.0
+
+        rng = random.Random(symbol)
+        fade = max(1, int(self.SAMPLE_RATE * 0.01))
+        samples = array("h")
+        for n in range(count):
+            voiced = sum(amplitude * math.sin(step * n) for step, amplitude in harmonics) / peak
+            value = (1.0 - noise) * voiced + noise * rng.uniform(-1.0, 1.0)
+            envelope = min(1.0, n / fade, (count - n) / fade)
+            samples.append(int(32767 * gain * envelope * value))
+
+        if sys.byteorder == "big":
+            samples.byteswap()
+        return samples.tobytes()
+
+
+ENGINES: Dict[str, TTSEngine] = {
+    "gtts": GTTSEngine(),
+    "espeak": EspeakEngine(),
+    "formant": FormantEngine()
+}
+
+# Voice presets per engine: voice -> engine parameters
+VOICE_PRESETS = {
+    "gtts": {
+        "woman": {"lang": "en", "tld": "com", "slow": False},  # American English for clear woman's voice
+        "man": {"lang": "en", "tld": "com.au", "slow": False},  # Australian accent for deeper, more masculine voice
+        "child": {"lang": "en", "tld": "co.uk", "slow": True}  # Slower speech for child-like voice
+    },
+    "espeak": {
+        "woman": {"voice": "en-us+f3", "pitch": 60, "speed": 160},
+        "man": {"voice": "en-us+m3", "pitch": 35, "speed": 155},
+        "child": {"voice": "en-us+f4", "pitch": 85, "speed": 140}
+    },
+    "formant": {
+        "woman": {"pitch": 210.0, "rate": 1.0},
+        "man": {"pitch": 115.0, "rate": 1.0},
+        "child": {"pitch": 300.0, "rate": 0.85}
+    }
+}
+
+
+def get_engine(name: str) -> TTSEngine:
+    """Get a registered engine by name"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown TTS engine: {name}")
+    return ENGINES[name]
+
+
+def build_voice_configs(engine_name: str = None) -> Dict[str, Dict]:
+    """
+    Build voice configurations for an engine
+
+    Args:
+        engine_name: Engine to use (defaults to the TTS_ENGINE env var, then gtts)
+
+    Returns:
+        Dictionary mapping voice to {"engine": name, **parameters}
+
+    Raises:
+        ValueError: If the engine is unknown or not installed
+    """
+    engine_name = engine_name or os.getenv("TTS_ENGINE", "gtts")
+    engine = get_engine(engine_name)
+    if not engine.available():
+        raise ValueError(f"TTS engine {engine_name} is not available on this machine")
+    return {
+        voice: {"engine": engine_name, **params}
+        for voice, params in VOICE_PRESETS[engine_name].items()
+    }
@@ -6,29 +6,166 @@ Starts the FastAPI server with automatic audio cleanup
 
 import sys
 import os
+import time
+import signal
+import socket
+import argparse
 import uvicorn
 from pathlib import Path
+from dotenv import load_dotenv
 
 # Add the backend directory to Python path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
+# Seconds between checks of the production master for exited workers and queued cleanup jobs
+MAINTENANCE_TICK = 1.0
+
+
+def run_development(host: str, port: int):
+    """Single process with auto-reload"""
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        reload=True,
+        log_level="info"
+    )
+
+
+def run_production(host: str, port: int, workers: int):
+    """
+    Pre-forked workers sharing one listening socket
+
+    Services are imported once in the master before forking, so workers
+    start instantly and share the loaded code and caches copy-on-write.
+    TTS_MAX_WORKERS stays a limit for the whole server: each worker's TTS
+    pool gets an equal share of it (at least one thread). STORY_WORKERS
+    applies per worker, but those threads only wait on the TTS pool.
+    The master owns all generated audio: each worker logs its files and
+    cache protections to the shared audio manifest, and the master runs
+    the garbage collector and cleanup jobs for all workers and removes
+    every file after they have stopped. The master stays single-threaded
+    so forking a replacement worker is always safe.
+    """
+    import main as app_module
+    from utils import cleanup
+    from utils.audio_gc import audio_gc
+    from utils.worker_pool import tts_pool
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    config = uvicorn.Config(app_module.app, log_level="info", reload=False)
+    tts_share = max(1, tts_pool.max_workers // workers)
+    children = {}
+    stopping = False
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            # Own process group: Ctrl+C reaches only the master, which stops workers once
+            os.setpgid(0, 0)
+            exit_code = 0
+            try:
+                cleanup.cleanup_manager.enter_worker(f"server-{os.getpid()}")
+                tts_pool.resize(tts_share)
+                uvicorn.Server(config).run(sockets=[sock])
+            except KeyboardInterrupt:
+                pass
+            except Exception as e:
+                print(f"❌ Worker {index} crashed: {e}")
+                exit_code = 1
+            finally:
+                sys.stdout.flush()
+                os._exit(exit_code)
+        children[pid] = index
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    # Replaces the exit cleanup signal handlers; cleanup runs once workers are gone
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for index in range(workers):
+        spawn(index)
+    print(f"👷 Started {workers} workers on http://{host}:{port}")
+    print(f"🎙️  TTS threads: {tts_share} per worker, {tts_share * workers} in total (TTS_MAX_WORKERS={tts_pool.max_workers})")
+    if tts_share * workers > tts_pool.max_workers:
+        print("⚠️  More workers than TTS_MAX_WORKERS: each worker still needs one TTS thread")
+
+    next_sweep = time.monotonic() + audio_gc.interval
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            if not stopping:
+                try:
+                    cleanup.cleanup_manager.run_cleanup_jobs()
+                    if time.monotonic() >= next_sweep:
+                        audio_gc.sweep()
+                        next_sweep = time.monotonic() + audio_gc.interval
+                except Exception as e:
+                    print(f"❌ Audio maintenance error: {e}")
+            time.sleep(MAINTENANCE_TICK)
+            continue
+
+        index = children.pop(pid, None)
+        # The worker's cache no longer protects anything
+        cleanup.cleanup_manager.drop_source(f"server-{pid}")
+        if index is not None and not stopping:
+            print(f"⚠️  Worker {index} exited with status {status}, restarting")
+            spawn(index)
+
+    sock.close()
+    # The master's exit cleanup removes everything the workers generated
+    cleanup.cleanup_manager.adopt_manifest()
+    print(f"\n🛑 Server stopped, cleaning up {cleanup.cleanup_manager.tracked_count()} audio files from workers")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Start the TextTale backend")
+    parser.add_argument("--production", action="store_true", default=os.getenv("TEXTTALE_ENV") == "production",
+                        help="Multi-worker server without reload (also enabled by TEXTTALE_ENV=production)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    if args.production and not hasattr(os, "fork"):
+        # Pre-forked workers need os.fork, which Windows does not have
+        print("❌ --production needs os.fork and is not supported on this platform")
+        print("💡 Run without --production, or start several servers behind a load balancer")
+        sys.exit(1)
+
+    # Load .env before the services read their configuration
+    load_dotenv()
+
     print("🎭 TextTale Backend Starting...")
     print("📁 Audio cleanup enabled - generated files will be removed on exit")
-    print("🚀 Starting server on http://localhost:8001")
+    print(f"🚀 Starting server on http://localhost:{args.port}")
     print("💡 Press Ctrl+C to stop the server and clean up audio files")
     print("🏗️  Using clean service architecture")
+    if args.production:
+        print(f"🏭 Production mode: {args.workers} workers, reload disabled")
     print("-" * 50)
-    
+
     try:
-        uvicorn.run(
-            "main:app",
-            host="0.0.0.0",
-            port=8001,
-            reload=True,
-            log_level="info"
-        )
+        if args.production:
+            run_production(args.host, args.port, args.workers)
+        else:
+            run_development(args.host, args.port)
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
         print("🧹 Audio cleanup will run automatically...")
@@ -37,4 +174,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+TextTale Story Worker Script
+Runs story generation jobs from the durable job queue in separate worker processes
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import argparse
+import threading
+import multiprocessing
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+# Load .env before the utilities and services read their configuration
+load_dotenv()
+
+from utils.job_queue import job_queue
+from utils.cleanup import init_cleanup
+from utils.audio_storage import AUDIO_ROOT
+
+HEARTBEAT_INTERVAL = 10
+
+
+def run_job(kind: str, payload: dict) -> dict:
+    """Run one job and return its JSON-serializable result"""
+    # Imported here so every worker process builds its own thread pools
+    from services import story_service, StoryResponse
+
+    if kind != "story":
+        raise ValueError(f"Unknown job kind: {kind}")
+    result = story_service.generate_story(**payload)
+    if not result["success"]:
+        raise RuntimeError(result["message"])
+    return StoryResponse(**result).model_dump()
+
+
+def run_worker(index: int, poll_interval: float):
+    """
+    Claim and run jobs until asked to stop
+
+    Workers never remove audio on exit: the files they generate are served
+    by the API process and must outlive the worker. Each file is logged to
+    the shared audio manifest so the API collects it like its own.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    init_cleanup(AUDIO_ROOT).enter_worker(f"story-{worker_id}", share_protection=False)
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        # Finish the current job, then exit
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    print(f"👷 Worker {index} ({worker_id}) ready")
+
+    while not stop.is_set():
+        job = job_queue.claim(worker_id, kind="story")
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+
+        job_id, kind, payload = job
+        print(f"👷 Worker {index} running job {job_id}")
+        finished = threading.Event()
+
+        def send_heartbeats():
+            while not finished.wait(HEARTBEAT_INTERVAL):
+                job_queue.heartbeat(job_id)
+
+        heartbeat = threading.Thread(target=send_heartbeats, daemon=True)
+        heartbeat.start()
+        try:
+            job_queue.complete(job_id, run_job(kind, payload))
+            print(f"✅ Worker {index} completed job {job_id}")
+        except Exception as e:
+            job_queue.fail(job_id, str(e))
+            print(f"❌ Worker {index} failed job {job_id}: {e}")
+        finally:
+            finished.set()
+            heartbeat.join()
+
+    print(f"👷 Worker {index} stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TextTale story workers")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--stale-timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    print("🎭 TextTale Story Workers Starting...")
+    print(f"🗄️  Job queue: {job_queue.path}")
+    print(f"👷 Starting {args.workers} worker processes")
+    print("💡 Press Ctrl+C to stop after the current jobs finish")
+    print("-" * 50)
+
+    recovered = job_queue.requeue_stale(args.stale_timeout)
+    if recovered:
+        print(f"♻️  Requeued {recovered} jobs from stopped workers")
+
+    def start(index: int) -> multiprocessing.Process:
+        process = multiprocessing.Process(target=run_worker, args=(index, args.poll_interval), name=f"story-worker-{index}")
+        process.start()
+        return process
+
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+
+    workers = [start(index) for index in range(args.workers)]
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    try:
+        while True:
+            time.sleep(5)
+            recovered = job_queue.requeue_stale(args.stale_timeout)
+            if recovered:
+                print(f"♻️  Requeued {recovered} stale jobs")
+            for index, process in enumerate(workers):
+                if not process.is_alive():
+                    print(f"⚠️  Worker {index} exited with code {process.exitcode}, restarting")
+                    workers[index] = start(index)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping workers...")
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+        for process in workers:
+            process.join()
+        print("✅ All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
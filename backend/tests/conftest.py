@@ -0,0 +1,11 @@
+"""
+Test configuration for TextTale backend
+Makes the backend packages importable from the tests
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
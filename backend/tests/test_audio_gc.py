@@ -0,0 +1,212 @@
+"""
+Tests for the audio garbage collector and cleanup
+TTL expiry, quota order, worker touches, cache expiry and leftover files on a temporary index
+"""
+
+import os
+import time
+import atexit
+import signal
+
+import pytest
+
+from utils import cleanup
+from utils.cleanup import AudioCleanup, AudioManifest
+from utils.audio_gc import AudioGarbageCollector
+from utils.lru_cache import LRUCache
+
+START = time.time()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [START]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    handlers = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+    manager = AudioCleanup(str(tmp_path / "audio"))
+    atexit.unregister(manager.cleanup_generated_files)
+    signal.signal(signal.SIGINT, handlers[0])
+    signal.signal(signal.SIGTERM, handlers[1])
+    manager.manifest = AudioManifest(str(tmp_path / "shared.db"))
+    monkeypatch.setattr(cleanup, "cleanup_manager", manager)
+    return manager
+
+
+def write_file(manager, name, size=100, mtime=START):
+    """Create a generated file of the given size and modification time and track it"""
+    path = manager.audio_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+    os.utime(path, (mtime, mtime))
+    manager.track_generated_file(str(path))
+    return str(path)
+
+
+def collector(**kwargs):
+    return AudioGarbageCollector(batch_pause=0, **kwargs)
+
+
+def test_files_expire_after_max_age_since_last_access(manager, clock):
+    idle = write_file(manager, "idle.wav")
+    served = write_file(manager, "served.wav")
+    clock[0] += 50
+    manager.touch_file(served)
+    clock[0] += 40
+
+    result = collector(max_age=60).sweep()
+
+    assert result["removed_files"] == 1
+    assert result["reclaimed_bytes"] == 100
+    assert not os.path.exists(idle)
+    assert os.path.exists(served)
+    assert [path for path, _, _ in manager.snapshot()] == [served]
+
+
+def test_protected_files_do_not_expire(manager, clock):
+    cached = write_file(manager, "cached.wav")
+    manager.protect_file(cached)
+    clock[0] += 1000
+
+    assert collector(max_age=60).sweep()["removed_files"] == 0
+    assert os.path.exists(cached)
+
+
+def test_quota_removes_least_recently_used_first_and_protected_last(manager, clock):
+    protected = write_file(manager, "protected.wav")
+    manager.protect_file(protected)
+    clock[0] += 1
+    older = write_file(manager, "older.wav")
+    clock[0] += 1
+    newer = write_file(manager, "newer.wav")
+    clock[0] += 1
+    newest = write_file(manager, "newest.wav")
+
+    # 400 bytes tracked: two unprotected files must go, oldest first
+    collector(max_age=3600, max_bytes=200).sweep()
+    assert [os.path.exists(path) for path in (protected, older, newer, newest)] == [True, False, False, True]
+
+    # Protected files are only removed when nothing else is left
+    collector(max_age=3600, max_bytes=50).sweep()
+    assert [os.path.exists(path) for path in (protected, newest)] == [False, False]
+
+
+def test_modification_time_counts_as_access(manager, clock):
+    path = write_file(manager, "worker-served.wav")
+    clock[0] += 120
+    # A server worker records an access by touching the file
+    os.utime(path, (clock[0], clock[0]))
+    clock[0] += 30
+
+    assert collector(max_age=60).sweep()["removed_files"] == 0
+    assert os.path.exists(path)
+
+
+def test_missing_files_are_forgotten(manager, clock):
+    path = write_file(manager, "gone.wav")
+    os.remove(path)
+
+    result = collector(max_age=60).sweep()
+
+    assert result["removed_files"] == 0
+    assert result["reclaimed_bytes"] == 0
+    assert manager.tracked_count() == 0
+
+
+def test_idle_cache_stops_protecting_expired_entries(manager, clock):
+    path = write_file(manager, "cached.wav")
+    cache = LRUCache(max_age=100, on_evict=lambda key, value: manager.release_file(value))
+    cache.put("key", path)
+    manager.protect_file(path)
+    gc = collector(max_age=60)
+    gc.watch_cache(cache)
+
+    clock[0] += 90
+    assert gc.sweep()["removed_files"] == 0
+
+    # Nobody reads the cache again; the sweep expires the entry itself
+    clock[0] += 20
+    result = gc.sweep()
+    assert result["expired_cache_entries"] == 1
+    assert result["removed_files"] == 1
+    assert len(cache) == 0
+
+
+def test_worker_only_expires_its_caches(manager, clock):
+    path = write_file(manager, "old.wav")
+    manager.enter_worker("server-1")
+    cache = LRUCache(max_age=10)
+    cache.put("key", path)
+    gc = collector(max_age=60)
+    gc.watch_cache(cache)
+    clock[0] += 100
+
+    assert gc.sweep() == {}
+    assert len(cache) == 0
+    assert os.path.exists(path)
+
+
+def write_temp_file(manager, name, mtime=START):
+    """Create a temporary file like the one a crashed writer leaves behind"""
+    path = manager.audio_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * 10)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_stale_temporary_files_are_removed(manager, clock):
+    stale = write_temp_file(manager, "ab/cd/.speech_woman_abcd.mp3.x1.tmp")
+    clock[0] += 1000
+    fresh = write_temp_file(manager, "ab/cd/.speech_woman_abce.mp3.x2.tmp", mtime=clock[0])
+    gc = collector(max_age=60, temp_max_age=600)
+
+    assert gc.sweep()["removed_temp_files"] == 1
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+    # The directory is scanned again only once temp_max_age has passed
+    clock[0] += 300
+    fresh_mtime = os.path.getmtime(fresh)
+    os.utime(fresh, (fresh_mtime - 400, fresh_mtime - 400))
+    assert gc.sweep()["removed_temp_files"] == 0
+    assert os.path.exists(fresh)
+    clock[0] += 300
+    assert gc.sweep()["removed_temp_files"] == 1
+    assert not os.path.exists(fresh)
+
+
+def test_exit_cleanup_prunes_empty_shard_directories(manager):
+    gone = write_file(manager, "ab/cd/speech_woman_abcd.wav")
+    kept = write_file(manager, "ab/ef/speech_woman_abef.wav")
+    manager.protect_file(kept)
+    untracked = manager.audio_dir / "12" / "34" / "speech_woman_1234.wav"
+    untracked.parent.mkdir(parents=True)
+    untracked.write_bytes(b"\0")
+
+    # A manual cleanup leaves directories alone; a writer may be about to use them
+    manager.cleanup_generated_files()
+    assert not os.path.exists(gone)
+    assert (manager.audio_dir / "ab" / "cd").is_dir()
+
+    write_file(manager, "ab/cd/speech_woman_abcd.wav")
+    manager.cleanup_generated_files(include_protected=True, prune_directories=True)
+
+    assert not (manager.audio_dir / "ab").exists()
+    assert untracked.exists()
+    assert manager.audio_dir.is_dir()
+
+
+def test_cleanup_all_removes_leftovers_and_empty_directories(manager):
+    write_file(manager, "ab/cd/speech_woman_abcd.mp3")
+    write_temp_file(manager, "ab/ef/.speech_woman_abef.mp3.x1.tmp")
+    (manager.audio_dir / "12" / "34").mkdir(parents=True)
+    (manager.audio_dir / "notes.txt").write_text("kept")
+
+    manager.cleanup_all_audio()
+
+    assert sorted(path.name for path in manager.audio_dir.rglob("*")) == ["notes.txt"]
@@ -0,0 +1,27 @@
+"""
+Tests for the shared audio manifest
+Files logged by worker processes are taken once, in order
+"""
+
+from utils.cleanup import AudioManifest
+
+
+def test_entries_are_taken_in_order_and_only_once(tmp_path):
+    path = str(tmp_path / "shared.db")
+    writer = AudioManifest(path)
+    reader = AudioManifest(path)
+    for n in range(5):
+        writer.append("story-1", "track", f"static/audio/{n}.wav")
+
+    first = reader.take(limit=3)
+    rest = reader.take()
+    assert [entry[2] for entry in first + rest] == [f"static/audio/{n}.wav" for n in range(5)]
+    assert first[0] == ("story-1", "track", "static/audio/0.wav")
+    assert reader.take() == []
+
+
+def test_take_does_not_create_the_database(tmp_path):
+    path = tmp_path / "shared.db"
+
+    assert AudioManifest(str(path)).take() == []
+    assert not path.exists()
@@ -0,0 +1,95 @@
+"""
+Tests for the audio splicing utility
+WAV and MP3 joins without re-encoding
+"""
+
+import io
+import os
+import wave
+
+import pytest
+
+from utils import audio_splice
+from utils.audio_splice import mp3_frame_range, splice_audio, wav_data_range
+
+
+def write_wav(path, frames: bytes, rate: int = 16000):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return str(path)
+
+
+def id3v2_tag(payload: bytes) -> bytes:
+    """ID3v2 header with a syncsafe size followed by the tag payload"""
+    size = len(payload)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + syncsafe + payload
+
+
+def test_wav_files_are_joined_into_one_valid_file(tmp_path):
+    first = write_wav(tmp_path / "a.wav", b"\x01\x00" * 100)
+    second = write_wav(tmp_path / "b.wav", b"\x02\x00" * 50)
+    out = tmp_path / "out.wav"
+    with open(out, "wb") as fp:
+        splice_audio([first, second], "wav", fp)
+
+    with wave.open(str(out), "rb") as wav:
+        assert wav.getnframes() == 150
+        assert wav.getframerate() == 16000
+        assert wav.readframes(150) == b"\x01\x00" * 100 + b"\x02\x00" * 50
+    _, offset, length = wav_data_range(str(out))
+    assert offset + length == os.path.getsize(out)
+
+
+def test_wav_files_with_different_formats_are_rejected(tmp_path):
+    first = write_wav(tmp_path / "a.wav", b"\x00\x00" * 10, rate=16000)
+    second = write_wav(tmp_path / "b.wav", b"\x00\x00" * 10, rate=22050)
+    with pytest.raises(ValueError):
+        splice_audio([first, second], "wav", io.BytesIO())
+
+
+def test_non_wav_input_is_rejected(tmp_path):
+    path = tmp_path / "a.wav"
+    path.write_bytes(b"not a wav file")
+    with pytest.raises(ValueError):
+        wav_data_range(str(path))
+
+
+def test_mp3_tags_are_stripped_from_the_frame_range(tmp_path):
+    frames = b"\xff\xfb\x90\x00" + b"\x11" * 200
+    path = tmp_path / "a.mp3"
+    path.write_bytes(id3v2_tag(b"\x00" * 30) + id3v2_tag(b"\x00" * 5) + frames + b"TAG" + b"\x00" * 125)
+
+    offset, length = mp3_frame_range(str(path))
+    assert path.read_bytes()[offset:offset + length] == frames
+
+
+def test_mp3_frames_are_concatenated_in_order(tmp_path):
+    first = tmp_path / "a.mp3"
+    second = tmp_path / "b.mp3"
+    first.write_bytes(id3v2_tag(b"\x00" * 10) + b"\xff\xfbAAAA")
+    second.write_bytes(b"\xff\xfbBBBB")
+    out = io.BytesIO()
+    splice_audio([str(first), str(second)], "mp3", out)
+    assert out.getvalue() == b"\xff\xfbAAAA\xff\xfbBBBB"
+
+
+def test_copy_falls_back_when_sendfile_fails(tmp_path, monkeypatch):
+    def refuse(*args):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(audio_splice.os, "sendfile", refuse, raising=False)
+    first = write_wav(tmp_path / "a.wav", b"\x03\x00" * 40)
+    out = tmp_path / "out.wav"
+    with open(out, "wb") as fp:
+        splice_audio([first, first], "wav", fp)
+    with wave.open(str(out), "rb") as wav:
+        assert wav.readframes(80) == b"\x03\x00" * 80
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        splice_audio([], "ogg", io.BytesIO())
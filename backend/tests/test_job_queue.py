@@ -0,0 +1,117 @@
+"""
+Tests for the job queue utility
+Claim order, heartbeats and recovery of jobs from stopped workers
+"""
+
+import pytest
+
+from utils import job_queue as job_queue_module
+from utils.job_queue import JobQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_queue_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(path=str(tmp_path / "jobs.db"), max_attempts=2)
+
+
+def test_jobs_are_claimed_oldest_first(queue, clock):
+    first = queue.enqueue("story", {"n": 1})
+    clock[0] += 1
+    second = queue.enqueue("story", {"n": 2})
+
+    assert queue.claim("w1") == (first, "story", {"n": 1})
+    assert queue.claim("w2") == (second, "story", {"n": 2})
+    assert queue.claim("w3") is None
+
+    job = queue.get(first)
+    assert job["status"] == "running"
+    assert job["worker"] == "w1"
+    assert job["attempts"] == 1
+
+
+def test_completed_and_failed_jobs_keep_their_outcome(queue):
+    done = queue.enqueue("story", {})
+    broken = queue.enqueue("story", {})
+    queue.claim("w")
+    queue.claim("w")
+    queue.complete(done, {"story": []})
+    queue.fail(broken, "boom")
+
+    assert queue.get(done)["result"] == {"story": []}
+    assert queue.get(broken)["error"] == "boom"
+    assert queue.stats() == {"completed": 1, "failed": 1}
+
+    # Finished jobs cannot be finished again
+    queue.fail(done, "late")
+    assert queue.get(done)["status"] == "completed"
+    assert queue.get("missing") is None
+
+
+def test_heartbeats_keep_running_jobs_from_going_stale(queue, clock):
+    job_id = queue.enqueue("story", {})
+    queue.claim("w")
+    clock[0] += 50
+    queue.heartbeat(job_id)
+    clock[0] += 50
+
+    assert queue.requeue_stale(timeout=60) == 0
+    assert queue.get(job_id)["status"] == "running"
+
+
+def test_stale_jobs_are_requeued_until_attempts_run_out(queue, clock):
+    job_id = queue.enqueue("story", {})
+    queue.claim("w1")
+    clock[0] += 120
+
+    assert queue.requeue_stale(timeout=60) == 1
+    job = queue.get(job_id)
+    assert job["status"] == "queued"
+    assert job["worker"] is None
+
+    # The second claim uses the last attempt
+    assert queue.claim("w2")[0] == job_id
+    clock[0] += 120
+    assert queue.requeue_stale(timeout=60) == 0
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 2
+    assert job["error"] == "Worker stopped responding"
+
+
+def test_a_stale_worker_cannot_complete_a_requeued_job(queue, clock):
+    job_id = queue.enqueue("story", {})
+    queue.claim("w1")
+    clock[0] += 120
+    queue.requeue_stale(timeout=60)
+
+    queue.complete(job_id, {"story": []})
+    assert queue.get(job_id)["status"] == "queued"
+
+
+def test_claim_filters_by_kind(queue, clock):
+    cleanup = queue.enqueue("cleanup", {})
+    clock[0] += 1
+    story = queue.enqueue("story", {"n": 1})
+
+    assert queue.claim("w1", kind="story") == (story, "story", {"n": 1})
+    assert queue.claim("w1", kind="story") is None
+    assert queue.claim("w2", kind="cleanup") == (cleanup, "cleanup", {})
+
+
+def test_update_progress_stores_partial_result(queue, clock):
+    job_id = queue.enqueue("cleanup", {})
+    queue.claim("w1")
+    clock[0] += 5
+    queue.update_progress(job_id, {"removed": 3})
+
+    job = queue.get(job_id)
+    assert job["status"] == "running"
+    assert job["result"] == {"removed": 3}
+    assert job["heartbeat_at"] == clock[0]
@@ -0,0 +1,105 @@
+"""
+Tests for the bounded LRU cache utility
+Entry, byte and age limits and the eviction callback
+"""
+
+from utils import lru_cache
+from utils.lru_cache import LRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_evicts_until_within_budget():
+    evicted = []
+    cache = LRUCache(max_entries=10, max_bytes=100, on_evict=lambda key, value: evicted.append(key))
+    cache.put("a", "A", size=40)
+    cache.put("b", "B", size=40)
+    cache.put("c", "C", size=40)
+
+    assert evicted == ["a"]
+    assert cache.stats()["bytes"] == 80
+
+    # Replacing an entry counts only its new size
+    cache.put("b", "B2", size=10)
+    assert cache.stats()["bytes"] == 50
+    assert evicted == ["a"]
+
+
+def test_oversized_entry_is_kept_until_the_next_insert():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.put("big", "x", size=50)
+    assert cache.get("big") == "x"
+    cache.put("small", "y", size=1)
+    assert "big" not in cache
+
+
+def test_expired_entries_miss_and_are_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru_cache.time, "time", lambda: now[0])
+    evicted = []
+    cache = LRUCache(max_entries=10, max_age=60, on_evict=lambda key, value: evicted.append(key))
+    cache.put("old", 1)
+    now[0] += 30
+    cache.put("new", 2)
+    now[0] += 31
+
+    assert cache.get("old") is None
+    assert cache.get("new") == 2
+    assert evicted == ["old"]
+
+    now[0] += 31
+    cache.put("newest", 3)
+    assert evicted == ["old", "new"]
+    assert cache.stats()["misses"] == 1
+
+
+def test_pop_skips_the_eviction_callback():
+    evicted = []
+    cache = LRUCache(on_evict=lambda key, value: evicted.append(key))
+    cache.put("a", 1, size=5)
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    assert evicted == []
+    assert cache.stats()["bytes"] == 0
+
+    cache.put("b", 2)
+    cache.clear()
+    assert evicted == ["b"]
+
+
+def test_failing_callback_does_not_break_the_cache():
+    def fail(key, value):
+        raise RuntimeError("boom")
+
+    cache = LRUCache(max_entries=1, on_evict=fail)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_purge_expired_evicts_without_access(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru_cache.time, "time", lambda: now[0])
+    evicted = []
+    cache = LRUCache(max_age=10, on_evict=lambda key, value: evicted.append(key))
+    cache.put("old", 1)
+    now[0] += 6
+    cache.put("new", 2)
+    now[0] += 5
+
+    assert cache.purge_expired() == 1
+    assert evicted == ["old"]
+    assert "new" in cache
+    assert LRUCache().purge_expired() == 0
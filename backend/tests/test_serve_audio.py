@@ -0,0 +1,153 @@
+"""
+Tests for the generated audio endpoint
+Path confinement, strong ETags, conditional and range requests
+"""
+
+import asyncio
+import atexit
+import signal
+
+import pytest
+
+HANDLERS = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+import main  # noqa: E402
+
+DIGEST = "0123456789abcdef0123456789abcdef"
+AUDIO = bytes(range(256)) * 4
+
+
+@pytest.fixture(scope="module", autouse=True)
+def quiet_cleanup_manager():
+    """Keep the app's cleanup manager from acting on the test process"""
+    atexit.unregister(main.cleanup_manager.cleanup_generated_files)
+    signal.signal(signal.SIGINT, HANDLERS[0])
+    signal.signal(signal.SIGTERM, HANDLERS[1])
+
+
+@pytest.fixture
+def audio_root(tmp_path, monkeypatch):
+    root = tmp_path / "audio"
+    (root / "01" / "23").mkdir(parents=True)
+    (root / "01" / "23" / f"speech_woman_{DIGEST}.mp3").write_bytes(AUDIO)
+    (root / "01" / "23" / f".speech_woman_{DIGEST}.mp3.tmp").write_bytes(AUDIO)
+    (root / "legacy.mp3").write_bytes(AUDIO)
+    (tmp_path / "secret.txt").write_text("secret")
+    (root / "link.mp3").symlink_to(tmp_path / "secret.txt")
+    monkeypatch.setattr(main, "AUDIO_ROOT", str(root))
+    return root
+
+
+def request(path: str, method: str = "GET", headers: dict = None):
+    """Send one request through the ASGI app and return (status, headers, body)"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in (headers or {}).items()],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000)
+    }
+    messages = []
+
+    async def run():
+        requested = False
+        finished = asyncio.Event()
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Like a server: the client disconnects once the response is complete
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished.set()
+
+        await main.app(scope, receive, send)
+
+    asyncio.run(run())
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    response_headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in start["headers"]}
+    body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+    return start["status"], response_headers, body
+
+
+@pytest.mark.parametrize("path", [
+    "/static/audio/../secret.txt",
+    "/static/audio/01/../../secret.txt",
+    "/static/audio/%2e%2e/secret.txt",
+    "/static/audio//etc/passwd",
+    "/static/audio/link.mp3",
+    "/static/audio/missing.mp3",
+    "/static/audio/01"
+])
+def test_paths_outside_generated_files_are_not_found(audio_root, path):
+    status, _, body = request(path)
+    assert status == 404
+    assert b"secret" not in body
+
+
+def test_temporary_files_are_hidden(audio_root):
+    status, _, _ = request(f"/static/audio/01/23/.speech_woman_{DIGEST}.mp3.tmp")
+    assert status == 404
+
+
+def test_content_addressed_file_has_strong_etag_and_immutable_caching(audio_root):
+    status, headers, body = request(f"/static/audio/01/23/speech_woman_{DIGEST}.mp3")
+
+    assert status == 200
+    assert body == AUDIO
+    assert headers["etag"] == f'"{DIGEST}"'
+    assert headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert headers["content-type"] == "audio/mpeg"
+
+
+@pytest.mark.parametrize("if_none_match", [f'"{DIGEST}"', f'W/"{DIGEST}"', f'"other", "{DIGEST}"', "*"])
+def test_matching_etag_is_not_modified(audio_root, if_none_match):
+    status, headers, body = request(f"/static/audio/01/23/speech_woman_{DIGEST}.mp3", headers={"If-None-Match": if_none_match})
+
+    assert status == 304
+    assert body == b""
+    assert headers["etag"] == f'"{DIGEST}"'
+
+
+def test_other_etag_gets_the_file(audio_root):
+    status, _, body = request(f"/static/audio/01/23/speech_woman_{DIGEST}.mp3", headers={"If-None-Match": '"other"'})
+    assert status == 200
+    assert body == AUDIO
+
+
+def test_range_request_gets_partial_content(audio_root):
+    status, headers, body = request(f"/static/audio/01/23/speech_woman_{DIGEST}.mp3", headers={"Range": "bytes=100-199"})
+
+    assert status == 206
+    assert body == AUDIO[100:200]
+    assert headers["content-range"] == f"bytes 100-199/{len(AUDIO)}"
+    assert headers["etag"] == f'"{DIGEST}"'
+
+
+def test_head_request_has_headers_without_body(audio_root):
+    status, headers, body = request(f"/static/audio/01/23/speech_woman_{DIGEST}.mp3", method="HEAD")
+
+    assert status == 200
+    assert body == b""
+    assert headers["content-length"] == str(len(AUDIO))
+
+
+def test_file_without_digest_must_be_revalidated(audio_root):
+    status, headers, body = request("/static/audio/legacy.mp3")
+
+    assert status == 200
+    assert body == AUDIO
+    assert headers["cache-control"] == "no-cache"
+    assert "etag" not in headers or headers["etag"] != f'"{DIGEST}"'
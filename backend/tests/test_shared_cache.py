@@ -0,0 +1,58 @@
+"""
+Tests for the shared cache utility
+Values are visible across instances and expire by age and count
+"""
+
+import pytest
+
+from utils import shared_cache as shared_cache_module
+from utils.shared_cache import SharedCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(shared_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def test_values_are_shared_between_instances(path, clock):
+    writer = SharedCache("stories", path=path)
+    reader = SharedCache("stories", path=path)
+    writer.put("a", {"scenes": [1, 2]})
+
+    assert reader.get("a") == {"scenes": [1, 2]}
+    assert reader.get("missing", "default") == "default"
+    assert reader.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_namespaces_are_separate(path, clock):
+    SharedCache("stories", path=path).put("a", 1)
+
+    assert SharedCache("other", path=path).get("a") is None
+
+
+def test_entries_expire_after_max_age(path, clock):
+    cache = SharedCache("stories", max_age=10, path=path)
+    cache.put("a", 1)
+    clock[0] += 11
+
+    assert cache.get("a") is None
+    cache.put("b", 2)
+    assert cache.stats()["entries"] == 1
+
+
+def test_oldest_entries_are_dropped_beyond_max_entries(path, clock):
+    cache = SharedCache("stories", max_entries=2, path=path)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+        clock[0] += 1
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "b"
+    assert cache.get("c") == "c"
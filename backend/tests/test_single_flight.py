@@ -0,0 +1,96 @@
+"""
+Tests for the single-flight utility
+Shared results and error propagation for concurrent callers
+"""
+
+import threading
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def run_concurrently(single_flight, key, fn, callers):
+    """Call single_flight.do from several threads while fn is blocked"""
+    results = [None] * callers
+    errors = [None] * callers
+
+    def call(index):
+        try:
+            results[index] = single_flight.do(key, fn)
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_for_followers(threads):
+    """Give the follower threads time to block on the leader's future"""
+    for thread in threads:
+        thread.join(0.05)
+
+
+def test_concurrent_calls_share_one_computation():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    threads, results, errors = run_concurrently(single_flight, "key", compute, 5)
+    wait_for_followers(threads)
+    assert single_flight.in_flight() == 1
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+    assert errors == [None] * 5
+    assert single_flight.in_flight() == 0
+
+
+def test_errors_reach_every_waiter_and_free_the_key():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, results, errors = run_concurrently(single_flight, "key", compute, 3)
+    wait_for_followers(threads)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert single_flight.in_flight() == 0
+    # The failed call is not cached: the next call computes again
+    assert single_flight.do("key", lambda: "retried") == "retried"
+
+
+def test_different_keys_do_not_share():
+    single_flight = SingleFlight()
+    assert single_flight.do("a", lambda: 1) == 1
+    assert single_flight.do("b", lambda: 2) == 2
+    with pytest.raises(KeyError):
+        single_flight.do("c", {}.__getitem__, "missing")
+
+
+def test_joined_callers_wait_for_the_leader():
+    single_flight = SingleFlight()
+    future, leader = single_flight.join("key")
+    follower_future, follower = single_flight.join("key")
+    assert leader and not follower
+    assert follower_future is future
+
+    single_flight.finish("key", future, "result")
+    assert follower_future.result(timeout=1) == "result"
+    assert single_flight.join("key")[1]
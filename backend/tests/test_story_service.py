@@ -0,0 +1,240 @@
+"""
+Tests for the story service
+Audio deadlines, response caching and coalescing, and lazy scene audio
+"""
+
+import os
+import threading
+import concurrent.futures
+
+import pytest
+
+from services.story_service import StoryService
+from utils.worker_pool import FairWorkerPool
+from utils.shared_cache import SharedCache
+from utils.lru_cache import LRUCache
+
+
+class StubAudioService:
+    """Audio service that writes placeholder files and can hold texts until released"""
+
+    batch_size = 0
+
+    def __init__(self):
+        self.calls = []
+        self.urls = {}
+        self.blocked = set()
+        self.release = threading.Event()
+        self.cache = LRUCache()
+        self._lock = threading.Lock()
+
+    def batch_enabled(self, voice=None):
+        return False
+
+    def get_cached_speech(self, text, voice=None):
+        url = self.urls.get(text)
+        return url if url and os.path.exists(url.lstrip("/")) else None
+
+    def generate_speech(self, text, voice=None):
+        with self._lock:
+            self.calls.append(text)
+            number = len(self.calls)
+        if text in self.blocked:
+            self.release.wait(10)
+        url = f"/static/audio/speech_{number}.mp3"
+        with open(url.lstrip("/"), "wb") as f:
+            f.write(b"audio")
+        self.urls[text] = url
+        return url
+
+    def generate_scene_audio(self, text, voice, scene_index):
+        return self.generate_speech(text, voice)
+
+
+class StubNoiseService:
+    """Background noise service that returns a fixed track, held while blocked"""
+
+    def __init__(self):
+        self.blocked = False
+        self.release = threading.Event()
+
+    def generate_background_noise(self, noise_type, duration=30):
+        if noise_type == "none":
+            return None
+        if self.blocked:
+            self.release.wait(10)
+        return f"/static/audio/{noise_type}.wav"
+
+    def get_available_noise_types(self):
+        return ["none"]
+
+
+class RecordingPool:
+    """Pool stand-in that runs jobs inline and records the texts in submission order"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, group, fn, *args):
+        self.submitted.append(args[0])
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("static/audio")
+    service = StoryService()
+    service.audio_service = StubAudioService()
+    service.background_noise_service = StubNoiseService()
+    service.tts_pool = pool = FairWorkerPool(max_workers=4, name="test")
+    service.lazy_stories = SharedCache("lazy_stories", path=str(tmp_path / "shared.db"))
+    yield service
+    service.audio_service.release.set()
+    service.background_noise_service.release.set()
+    pool.shutdown()
+    service.request_executor.shutdown()
+
+
+def scene_texts(service, prompt="A fox", length="short"):
+    return [scene["text"] for scene in service.narrative_service.generate_structured_narrative(prompt, "fantasy", length)]
+
+
+def test_deadline_leaves_slow_scenes_without_audio(service):
+    texts = scene_texts(service)
+    service.audio_service.blocked = {texts[2]}
+    service.tts_pool = FairWorkerPool(max_workers=1, name="test")
+    service.audio_deadline = 0.3
+
+    result = service.generate_story("A fox", "fantasy", "short")
+
+    # Scene 3 holds the only pool thread, so it and every scene queued behind it miss the deadline
+    assert result["success"]
+    assert result["missingAudio"] == list(range(3, len(texts) + 1))
+    assert [bool(scene["audioUrl"]) for scene in result["story"]] == [True, True] + [False] * (len(texts) - 2)
+    assert "scenes without audio" in result["message"]
+
+    # Queued scenes were cancelled instead of being synthesized for nobody
+    service.audio_service.release.set()
+    service.tts_pool.shutdown()
+    assert service.audio_service.calls == texts[:3]
+    assert service.tts_pool.stats()["cancelled"] == len(texts) - 3
+
+
+def test_incomplete_stories_are_not_cached(service):
+    service.audio_service.blocked = {scene_texts(service)[0]}
+    service.audio_deadline = 0.1
+    service.generate_story("A fox", "fantasy", "short")
+
+    assert len(service.response_cache) == 0
+
+
+def test_identical_concurrent_requests_share_one_generation(service):
+    texts = scene_texts(service)
+    service.audio_service.blocked = set(texts)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(service.generate_story, "A fox", "fantasy", "short") for _ in range(4)]
+        # Let every caller join the leader's flight before audio finishes
+        while service._single_flight.in_flight() == 0 or len(service.audio_service.calls) < 4:
+            threading.Event().wait(0.01)
+        threading.Event().wait(0.1)
+        service.audio_service.release.set()
+        results = [future.result(timeout=10) for future in futures]
+
+    assert sorted(service.audio_service.calls) == sorted(texts)
+    assert all(result == results[0] for result in results)
+    assert results[0]["missingAudio"] == []
+
+
+def test_complete_story_is_served_from_cache(service):
+    first = service.generate_story("A fox", "fantasy", "short")
+    calls = len(service.audio_service.calls)
+
+    second = service.generate_story("A fox", "fantasy", "short")
+
+    assert second == first
+    assert len(service.audio_service.calls) == calls
+    # Callers get their own copies
+    second["story"][0]["audioUrl"] = "changed"
+    assert service.generate_story("A fox", "fantasy", "short")["story"][0]["audioUrl"] == first["story"][0]["audioUrl"]
+
+
+def test_cached_story_with_deleted_audio_is_regenerated(service):
+    first = service.generate_story("A fox", "fantasy", "short")
+    os.remove(first["story"][0]["audioUrl"].lstrip("/"))
+
+    second = service.generate_story("A fox", "fantasy", "short")
+
+    assert second["missingAudio"] == []
+    assert second["story"][0]["audioUrl"] != first["story"][0]["audioUrl"]
+    assert os.path.exists(second["story"][0]["audioUrl"].lstrip("/"))
+    assert service.audio_service.calls.count(first["story"][0]["text"]) == 2
+
+
+def test_lazy_story_registers_placeholders_without_synthesis(service):
+    result = service.generate_story("A fox", "fantasy", "short", lazy_audio=True)
+    story_id = result["story"][0]["audioUrl"].split("/")[3]
+
+    assert service.audio_service.calls == []
+    assert [scene["audioUrl"] for scene in result["story"]] == [
+        f"/api/story-audio/{story_id}/scenes/{n}" for n in range(1, len(result["story"]) + 1)
+    ]
+
+
+def test_lazy_scene_is_queued_before_its_prefetches(service):
+    texts = scene_texts(service)
+    result = service.generate_story("A fox", "fantasy", "short", lazy_audio=True)
+    story_id = result["story"][0]["audioUrl"].split("/")[3]
+    service.tts_pool = RecordingPool()
+    service.lazy_prefetch = 2
+
+    assert service.get_lazy_scene_audio(story_id, 3) == service.audio_service.urls[texts[2]]
+    assert service.tts_pool.submitted == [texts[2], texts[3], texts[4]]
+
+    # Scene 4 is ready now; only scene 6 is new to prefetch
+    service.get_lazy_scene_audio(story_id, 4)
+    assert service.tts_pool.submitted[3:] == [texts[5]]
+
+    # Nothing is prefetched past the last scene
+    submitted = len(service.tts_pool.submitted)
+    service.get_lazy_scene_audio(story_id, len(texts))
+    assert service.tts_pool.submitted[submitted:] == [texts[-1]]
+
+
+def test_lazy_scene_out_of_range_is_unknown(service):
+    result = service.generate_story("A fox", "fantasy", "short", lazy_audio=True)
+    story_id = result["story"][0]["audioUrl"].split("/")[3]
+
+    for scene_number in (0, len(result["story"]) + 1):
+        with pytest.raises(LookupError):
+            service.get_lazy_scene_audio(story_id, scene_number)
+
+
+def test_unknown_lazy_story_is_unknown(service):
+    with pytest.raises(LookupError):
+        service.get_lazy_scene_audio("missing", 1)
+    with pytest.raises(LookupError):
+        service.get_lazy_background_audio("missing")
+
+
+def test_stream_sends_scenes_before_the_background_noise_is_ready(service):
+    service.background_noise_service.blocked = True
+    stream = service.generate_story_stream("A fox", "fantasy", "short", background_noise="rain")
+
+    assert next(stream)["type"] == "story"
+    first = next(stream)
+    assert first["type"] == "scene" and first["scene"]["sceneNumber"] == 1
+    assert first["scene"]["backgroundNoiseUrl"] == ""
+
+    service.background_noise_service.release.set()
+    events = list(stream)
+    types = [event["type"] for event in events]
+
+    assert types.count("background") == 1
+    assert types[-1] == "done"
+    background = types.index("background")
+    assert events[background]["backgroundNoiseUrl"] == "/static/audio/rain.wav"
+    # Every scene after the background event carries the track as well
+    assert all(event["scene"]["backgroundNoiseUrl"] == "/static/audio/rain.wav" for event in events[background + 1:-1])
@@ -0,0 +1,138 @@
+"""
+Tests for the TTS client service
+Single and batched gTTS requests against the local stub server
+"""
+
+import io
+import json
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+from gtts import gTTS, gTTSError
+
+from tts_stub_server import StubTTSHandler, SILENT_FRAME
+from services import tts_client as tts_client_module
+from services.tts_client import TTSClient
+from services.tts_engines import GTTSEngine
+
+LONG_TEXT = "A lighthouse keeper walks along the cliffs at night. " * 5
+
+
+class CountingHandler(StubTTSHandler):
+    """Stub handler that records the RPCs per request and can drop one answer"""
+
+    requests = []
+    drop_index = None
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        rpcs = json.loads(urllib.parse.parse_qs(body)["f.req"][0])[0]
+        self.requests.append(len(rpcs))
+
+        # Leave one RPC unanswered, like a backend that rejects part of a batch
+        kept = [rpc for rpc in rpcs if rpc[3] != self.drop_index]
+        body = "f.req={}&".format(urllib.parse.quote(json.dumps([kept]))).encode("utf-8")
+        self.headers.replace_header("Content-Length", str(len(body)))
+        connection, self.rfile = self.rfile, io.BytesIO(body)
+        try:
+            super().do_POST()
+        finally:
+            # Keep-alive: the next request arrives on the same connection
+            self.rfile = connection
+
+
+@pytest.fixture
+def server():
+    CountingHandler.requests = []
+    CountingHandler.drop_index = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    return TTSClient(retries=0, base_url=f"http://127.0.0.1:{server.server_address[1]}")
+
+
+def expected_audio(tts):
+    """Audio the stub returns for a gTTS object: one fixed payload per text part"""
+    return SILENT_FRAME * StubTTSHandler.frames_per_part * len(tts._prepare_requests())
+
+
+def test_single_request_per_text_part(client):
+    tts = gTTS(LONG_TEXT)
+    fp = io.BytesIO()
+    client.write_to_fp(tts, fp)
+
+    parts = len(tts._prepare_requests())
+    assert parts > 1
+    assert CountingHandler.requests == [1] * parts
+    assert fp.getvalue() == expected_audio(tts)
+
+
+def test_prepared_requests_carry_one_generic_rpc():
+    # synthesize_batch renumbers these RPCs; a gTTS upgrade must keep their shape
+    tts = gTTS(LONG_TEXT, lang="en", slow=True)
+    for prepared in tts._prepare_requests():
+        rpcs = json.loads(urllib.parse.parse_qs(prepared.body)["f.req"][0])
+        assert len(rpcs) == 1 and len(rpcs[0]) == 1
+        rpc_id, parameter, _, index = rpcs[0][0]
+        assert rpc_id == tts.GOOGLE_TTS_RPC
+        assert index == "generic"
+        assert json.loads(parameter)[1] == "en"
+        assert prepared.url.endswith("/_/TranslateWebserverUi/data/batchexecute")
+
+
+def test_client_decodes_responses_like_installed_gtts(client, monkeypatch):
+    tts = gTTS(LONG_TEXT)
+    ours = io.BytesIO()
+    client.write_to_fp(tts, ours)
+
+    # gTTS's own request loop and parser, redirected to the stub server
+    send = requests.Session.send
+
+    def send_to_stub(session, request, **kwargs):
+        request.url = client._rewrite_url(request.url)
+        return send(session, request, **kwargs)
+
+    monkeypatch.setattr(requests.Session, "send", send_to_stub)
+    theirs = io.BytesIO()
+    tts.write_to_fp(theirs)
+
+    assert theirs.getvalue() == ours.getvalue() == expected_audio(tts)
+
+
+def test_batch_sends_all_parts_in_one_request(client):
+    ttses = [gTTS("Hello there."), gTTS(LONG_TEXT), gTTS("Short.")]
+    segments = client.synthesize_batch(ttses)
+
+    parts = [len(tts._prepare_requests()) for tts in ttses]
+    assert CountingHandler.requests == [sum(parts)]
+    assert [len(s) for s in segments] == parts
+    assert [b"".join(s) for s in segments] == [expected_audio(tts) for tts in ttses]
+
+
+def test_batch_with_missing_answer_raises(client):
+    CountingHandler.drop_index = "2"
+    with pytest.raises(gTTSError):
+        client.synthesize_batch([gTTS("One."), gTTS("Two."), gTTS("Three.")])
+
+
+def test_engine_falls_back_to_single_requests(client, monkeypatch):
+    monkeypatch.setattr(tts_client_module, "tts_client", client)
+    monkeypatch.setattr("services.tts_engines.tts_client", client)
+    CountingHandler.drop_index = "1"
+    texts = ["One.", "Two."]
+    fps = [io.BytesIO(), io.BytesIO()]
+
+    GTTSEngine().synthesize_batch(texts, fps)
+
+    assert CountingHandler.requests == [2, 1, 1]
+    assert [fp.getvalue() for fp in fps] == [expected_audio(gTTS(text)) for text in texts]
@@ -0,0 +1,112 @@
+"""
+Tests for the shared worker pool utility
+Round-robin scheduling across groups and job accounting
+"""
+
+import threading
+
+import pytest
+
+from utils.worker_pool import FairWorkerPool
+
+
+def blocked_pool():
+    """Single-worker pool whose worker is held until the returned event is set"""
+    pool = FairWorkerPool(max_workers=1, name="test")
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    pool.submit("hold", hold)
+    assert started.wait(5)
+    return pool, release
+
+
+def test_jobs_run_round_robin_across_groups():
+    pool, release = blocked_pool()
+    order = []
+    futures = [pool.submit("a", order.append, f"a{i}") for i in range(3)]
+    futures += [pool.submit("b", order.append, f"b{i}") for i in range(2)]
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    pool.shutdown()
+
+    assert order == ["a0", "b0", "a1", "b1", "a2"]
+
+
+def test_concurrency_never_exceeds_max_workers():
+    pool = FairWorkerPool(max_workers=3, name="test")
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        threading.Event().wait(0.01)
+        with lock:
+            running[0] -= 1
+
+    futures = [pool.submit(i % 4, job) for i in range(20)]
+    for future in futures:
+        future.result(timeout=5)
+    pool.shutdown()
+
+    assert peak[0] <= 3
+    assert pool.stats()["completed"] == 20
+
+
+def test_cancelled_jobs_are_counted_and_skipped():
+    pool, release = blocked_pool()
+    ran = []
+    cancelled = pool.submit("a", ran.append, "cancelled")
+    kept = pool.submit("a", ran.append, "kept")
+    assert cancelled.cancel()
+    release.set()
+    kept.result(timeout=5)
+    pool.shutdown()
+
+    stats = pool.stats()
+    assert ran == ["kept"]
+    assert stats["cancelled"] == 1
+    assert stats["completed"] == 2
+    assert stats["failed"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_failures_reach_the_future_and_metrics():
+    pool = FairWorkerPool(max_workers=2, name="test")
+
+    def fail():
+        raise ValueError("boom")
+
+    future = pool.submit("a", fail)
+    with pytest.raises(ValueError, match="boom"):
+        future.result(timeout=5)
+    pool.shutdown()
+
+    assert pool.stats()["failed"] == 1
+
+
+def test_submit_after_shutdown_is_rejected():
+    pool = FairWorkerPool(max_workers=1, name="test")
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.submit("a", print)
+
+
+def test_resize_only_before_the_pool_starts():
+    pool = FairWorkerPool(max_workers=8, name="test")
+    pool.resize(2)
+    pool.submit("a", lambda: None).result(timeout=5)
+
+    assert pool.stats()["max_workers"] == 2
+    assert len(pool._threads) == 2
+    with pytest.raises(RuntimeError):
+        pool.resize(4)
+    pool.shutdown()
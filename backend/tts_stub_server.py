@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Local TTS Stub Server for TextTale
+Answers gTTS batchexecute requests (one or many RPCs) with a fixed MP3 payload for offline benchmarking
+"""
+
+import sys
+import json
+import base64
+import argparse
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz)
+SILENT_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    """Handler mimicking the Google Translate TTS RPC endpoint"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real backend
+    disable_nagle_algorithm = True
+    wbufsize = 1 << 16  # send headers and body in one write
+    frames_per_part = 8
+
+    def do_POST(self):
+        content_length = int(self.headers.get("Content-Length", 0))
+        form = urllib.parse.parse_qs(self.rfile.read(content_length).decode("utf-8"))
+        rpcs = json.loads(form["f.req"][0])[0]
+
+        # One answer per RPC, tagged with the RPC's index like the real backend
+        audio = base64.b64encode(SILENT_FRAME * self.frames_per_part).decode("ascii")
+        chunks = []
+        for rpc_id, _, _, index in rpcs:
+            answer = json.dumps([["wrb.fr", rpc_id, json.dumps([audio]), None, None, None, index]], separators=(",", ":"))
+            chunks.append(f"{len(answer)}\n{answer}\n")
+        body = (")]}'\n\n" + "".join(chunks)).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub server on a background thread and return it"""
+    server = ThreadingHTTPServer((host, port), StubTTSHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local gTTS stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), StubTTSHandler)
+    print(f"TTS stub server listening on http://{args.host}:{args.port}")
+    print(f"Point the backend at it with TTS_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStub server stopped")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
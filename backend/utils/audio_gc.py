@@ -0,0 +1,191 @@
+"""
+Audio garbage collector for TextTale application
+Incrementally expires generated audio files while the server is running
+"""
+
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+from utils import cleanup
+from utils.lru_cache import LRUCache
+
+
+class AudioGarbageCollector:
+    """
+    Background collector that expires generated audio by last access time
+    and keeps total disk usage under a quota
+
+    Sweeps run on a daemon thread every `interval` seconds and process
+    tracked files in batches of `batch_size`, pausing between batches so
+    request threads are never starved. Files protected by the audio cache
+    are only removed when the quota cannot be met otherwise. Each sweep
+    first expires the watched caches, so an idle cache cannot protect its
+    files past the cache's own max age. Temporary files a crashed writer
+    left behind are removed once they are older than `temp_max_age`; the
+    audio directory is scanned for them at most once per `temp_max_age`.
+    Only the process that owns the cleanup index collects: production
+    server workers just expire their caches, and the master calls sweep()
+    for all of them.
+    """
+
+    def __init__(
+        self,
+        max_age: float = 3600,
+        max_bytes: Optional[int] = None,
+        interval: float = 60,
+        batch_size: int = 500,
+        batch_pause: float = 0.01,
+        temp_max_age: float = 600
+    ):
+        """
+        Args:
+            max_age: Seconds since last access after which a file expires
+            max_bytes: Disk quota for generated audio (None for unlimited)
+            interval: Seconds between sweeps
+            batch_size: Files processed per batch
+            batch_pause: Pause between batches in seconds
+            temp_max_age: Seconds after which an unfinished temporary file is stale
+        """
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.temp_max_age = temp_max_age
+        self._last_temp_scan = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_sweep: Dict = {}
+        self.total_reclaimed_bytes = 0
+        self._caches: List[LRUCache] = []
+
+    def watch_cache(self, cache: LRUCache):
+        """Expire a cache whose evictions release audio files before every sweep"""
+        self._caches.append(cache)
+
+    def start(self):
+        """Start the background sweep thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audio-gc", daemon=True)
+        self._thread.start()
+        print(f"Audio GC started (max age {self.max_age}s, quota {self.max_bytes} bytes, every {self.interval}s)")
+
+    def stop(self):
+        """Stop the background sweep thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Audio GC sweep error: {e}")
+
+    def sweep(self) -> Dict:
+        """
+        Run one incremental collection pass
+
+        Returns:
+            Dictionary with removed file count, reclaimed bytes and duration
+            (empty in a server worker, which only expires its caches)
+        """
+        start = time.perf_counter()
+        expired = sum(cache.purge_expired() for cache in self._caches)
+
+        manager = cleanup.cleanup_manager
+        if manager is None or manager.is_worker:
+            return {}
+
+        manager.adopt_manifest()
+        now = time.time()
+        removed_temp = 0
+        if self._last_temp_scan is None or now - self._last_temp_scan >= self.temp_max_age:
+            self._last_temp_scan = now
+            removed_temp = manager.remove_stale_temp_files(self.temp_max_age)
+        removed = 0
+        reclaimed = 0
+        survivors: List[Tuple[float, int, str, bool]] = []  # (last access, size, path, protected)
+
+        tracked = manager.snapshot()
+        for offset in range(0, len(tracked), self.batch_size):
+            for file_path, last_access, protected in tracked[offset:offset + self.batch_size]:
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    manager.forget_file(file_path)
+                    continue
+                # Server workers record accesses as modification times
+                last_access = max(last_access, stat.st_mtime)
+                if not protected and now - last_access > self.max_age:
+                    if self._remove(manager, file_path):
+                        removed += 1
+                        reclaimed += stat.st_size
+                else:
+                    survivors.append((last_access, stat.st_size, file_path, protected))
+            if self._stop.is_set():
+                break
+            time.sleep(self.batch_pause)
+
+        # Enforce the disk quota, least recently used first, cache-protected files last
+        if self.max_bytes is not None:
+            usage = sum(size for _, size, _, _ in survivors)
+            survivors.sort(key=lambda entry: (entry[3], entry[0]))
+            for count, (_, size, file_path, _) in enumerate(survivors):
+                if usage <= self.max_bytes:
+                    break
+                if self._remove(manager, file_path):
+                    removed += 1
+                    reclaimed += size
+                    usage -= size
+                if count % self.batch_size == self.batch_size - 1:
+                    time.sleep(self.batch_pause)
+
+        self.total_reclaimed_bytes += reclaimed
+        self.last_sweep = {
+            "expired_cache_entries": expired,
+            "tracked_files": len(tracked),
+            "removed_files": removed,
+            "removed_temp_files": removed_temp,
+            "reclaimed_bytes": reclaimed,
+            "duration_seconds": time.perf_counter() - start,
+            "finished_at": time.time()
+        }
+        if removed or removed_temp:
+            print(f"Audio GC sweep: removed {removed} files and {removed_temp} stale temporary files, reclaimed {reclaimed} bytes")
+        return self.last_sweep
+
+    def _remove(self, manager: cleanup.AudioCleanup, file_path: str) -> bool:
+        """Delete one generated file and stop tracking it"""
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Audio GC could not remove {os.path.basename(file_path)}: {e}")
+            return False
+        manager.forget_file(file_path)
+        return True
+
+    def stats(self) -> Dict:
+        """Get collector statistics"""
+        return {
+            "max_age_seconds": self.max_age,
+            "max_bytes": self.max_bytes,
+            "total_reclaimed_bytes": self.total_reclaimed_bytes,
+            "last_sweep": self.last_sweep
+        }
+
+
+# Global audio garbage collector
+audio_gc = AudioGarbageCollector(
+    max_age=float(os.getenv("AUDIO_GC_MAX_AGE", "3600")),
+    max_bytes=int(os.getenv("AUDIO_GC_MAX_BYTES", str(1024 * 1024 * 1024))),
+    interval=float(os.getenv("AUDIO_GC_INTERVAL", "60")),
+    batch_size=int(os.getenv("AUDIO_GC_BATCH_SIZE", "500")),
+    temp_max_age=float(os.getenv("AUDIO_GC_TEMP_MAX_AGE", "600"))
+)
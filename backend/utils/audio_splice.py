@@ -0,0 +1,155 @@
+"""
+Audio splicing utility for TextTale application
+Joins encoded audio files without re-encoding, copying payloads in the kernel
+"""
+
+import os
+import struct
+from typing import List, Tuple
+
+
+def copy_range(src, dst, offset: int, count: int):
+    """
+    Append count bytes of src starting at offset to dst
+
+    Uses os.sendfile where available so the bytes never enter Python, and
+    falls back to a buffered copy otherwise.
+
+    Args:
+        src: Readable binary file object
+        dst: Writable binary file object
+        offset: Start of the byte range in src
+        count: Number of bytes to copy
+    """
+    dst.flush()
+    if hasattr(os, "sendfile"):
+        try:
+            while count > 0:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+                if sent == 0:
+                    break
+                offset += sent
+                count -= sent
+            return
+        except OSError:
+            # Kernel refuses file-to-file sendfile - copy the rest in userspace
+            pass
+    src.seek(offset)
+    remaining = count
+    while remaining > 0:
+        chunk = src.read(min(remaining, 1 << 16))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+def mp3_frame_range(path: str) -> Tuple[int, int]:
+    """
+    Locate the MPEG audio frames of an MP3 file
+
+    Skips leading ID3v2 tags and a trailing ID3v1 tag so the frames of
+    several files can be joined into one valid stream.
+
+    Args:
+        path: MP3 file path
+
+    Returns:
+        Tuple of (offset, length) of the frame data
+    """
+    size = os.path.getsize(path)
+    start, end = 0, size
+    with open(path, "rb") as f:
+        while True:
+            f.seek(start)
+            header = f.read(10)
+            if len(header) < 10 or header[:3] != b"ID3":
+                break
+            # Syncsafe tag size, plus 10 more bytes when a footer is present
+            tag_size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+            start += 10 + tag_size + (10 if header[5] & 0x10 else 0)
+
+        if end - start >= 128:
+            f.seek(end - 128)
+            if f.read(3) == b"TAG":
+                end -= 128
+    return start, max(0, end - start)
+
+
+def wav_data_range(path: str) -> Tuple[bytes, int, int]:
+    """
+    Locate the PCM data of a WAV file
+
+    Args:
+        path: WAV file path
+
+    Returns:
+        Tuple of (fmt chunk payload, data offset, data length)
+    """
+    with open(path, "rb") as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise ValueError(f"Not a WAV file: {path}")
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"WAV file without data chunk: {path}")
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                f.seek(chunk_size & 1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"WAV data before fmt chunk: {path}")
+                return fmt, f.tell(), chunk_size
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def splice_mp3(paths: List[str], fp):
+    """Write the MPEG frames of several MP3 files to fp as one stream"""
+    for path in paths:
+        offset, length = mp3_frame_range(path)
+        with open(path, "rb") as src:
+            copy_range(src, fp, offset, length)
+
+
+def splice_wav(paths: List[str], fp):
+    """
+    Write the PCM data of several WAV files to fp as one WAV file
+
+    All inputs must share the same sample format.
+    """
+    ranges = [wav_data_range(path) for path in paths]
+    fmt = ranges[0][0]
+    if any(other_fmt != fmt for other_fmt, _, _ in ranges):
+        raise ValueError("WAV files use different sample formats")
+
+    data_size = sum(length for _, _, length in ranges)
+    fp.write(struct.pack("<4sI4s", b"RIFF", 4 + 8 + len(fmt) + 8 + data_size, b"WAVE"))
+    fp.write(struct.pack("<4sI", b"fmt ", len(fmt)) + fmt)
+    fp.write(struct.pack("<4sI", b"data", data_size))
+    for path, (_, offset, length) in zip(paths, ranges):
+        with open(path, "rb") as src:
+            copy_range(src, fp, offset, length)
+
+
+def splice_audio(paths: List[str], extension: str, fp):
+    """
+    Splice audio files of one format into fp
+
+    Args:
+        paths: Input files in playback order
+        extension: Format of the inputs ("mp3" or "wav")
+        fp: Writable binary file object
+
+    Raises:
+        ValueError: If the format cannot be spliced
+    """
+    if extension == "mp3":
+        splice_mp3(paths, fp)
+    elif extension == "wav":
+        splice_wav(paths, fp)
+    else:
+        raise ValueError(f"Cannot splice {extension} audio")
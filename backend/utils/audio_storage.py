@@ -0,0 +1,68 @@
+"""
+Audio storage utility for TextTale application
+Content-addressed, sharded file layout and atomic writes for generated audio
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Root directory of generated audio, served under /static/audio
+AUDIO_ROOT = "static/audio"
+
+
+def audio_file_path(prefix: str, digest: str, extension: str, root: str = AUDIO_ROOT) -> str:
+    """
+    Build the sharded path of a content-addressed audio file
+
+    Files live in two levels of hash-prefix directories
+    (static/audio/ab/cd/speech_woman_abcd....mp3), so no directory grows
+    beyond a few thousand entries even with millions of files.
+
+    Args:
+        prefix: File name prefix, e.g. "speech_woman"
+        digest: Hex content hash identifying the audio
+        extension: File extension of the engine output
+        root: Audio root directory
+
+    Returns:
+        Relative file path; its parent directories are created
+    """
+    directory = f"{root}/{digest[:2]}/{digest[2:4]}"
+    os.makedirs(directory, exist_ok=True)
+    return f"{directory}/{prefix}_{digest[:32]}.{extension}"
+
+
+def audio_url(audio_path: str) -> str:
+    """Public URL of a file under the static directory"""
+    return f"/{audio_path}"
+
+
+@contextmanager
+def atomic_audio_file(audio_path: str):
+    """
+    Open a temporary file next to audio_path and publish it atomically
+
+    Audio is streamed into the temporary file chunk by chunk and renamed over
+    audio_path only when writing succeeds, so readers never see a partial
+    file and memory use does not grow with the audio length.
+
+    Args:
+        audio_path: Final location of the audio file
+
+    Yields:
+        Writable binary file object
+    """
+    directory, filename = os.path.split(audio_path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, audio_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -4,85 +4,479 @@ Automatically removes generated audio files when the application exits
 """
 
 import os
-import glob
 import signal
+import socket
 import sys
+import time
 import atexit
+import threading
+import concurrent.futures
+from collections import defaultdict
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from utils.sqlite_store import SQLiteStore
+from utils.job_queue import job_queue
+
+# Extensions written by the TTS engines
+AUDIO_EXTENSIONS = ("mp3", "wav")
+
+class AudioManifest(SQLiteStore):
+    """
+    Shared log of audio files generated by worker processes
+    
+    Workers append to the log; the process that owns the cleanup index
+    takes the entries in order and deletes them once applied.
+    """
+    
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS audio_manifest (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    event TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+"""
+    
+    def append(self, source: str, event: str, file_path: str):
+        """Log an event (e.g. "track") for a file"""
+        self._connection().execute(
+            "INSERT INTO audio_manifest (source, event, path) VALUES (?, ?, ?)",
+            (source, event, file_path)
+        )
+    
+    def take(self, limit: int = 10000) -> List[Tuple[str, str, str]]:
+        """
+        Remove and return the oldest entries
+        
+        Returns:
+            List of (source, event, path) in logging order
+        """
+        # No worker has logged anything yet; don't create the database just to look
+        if not os.path.exists(self.path):
+            return []
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, source, event, path FROM audio_manifest ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+            if rows:
+                connection.execute("DELETE FROM audio_manifest WHERE id <= ?", (rows[-1]["id"],))
+        return [(row["source"], row["event"], row["path"]) for row in rows]
+
+class TrackedFile:
+    """Index entry for one generated audio file"""
+    __slots__ = ("last_access", "protected", "holders")
+    
+    def __init__(self, last_access: float, protected: bool = False):
+        self.last_access = last_access
+        self.protected = protected
+        # Worker processes whose caches protect the file
+        self.holders = None
+    
+    def is_protected(self) -> bool:
+        """Whether this process or any worker protects the file"""
+        return self.protected or bool(self.holders)
+
+def cleanup_job_status(job: Dict) -> Dict:
+    """
+    Get status, progress and throughput of a cleanup job
+    
+    Args:
+        job: Cleanup job as returned by job_queue.get
+    """
+    progress = job["result"] or {}
+    total = progress.get("total", 0)
+    removed = progress.get("removed", 0)
+    failed = progress.get("failed", 0)
+    processed = removed + failed
+    end = job["finished_at"] or time.time()
+    elapsed = end - job["started_at"] if job["started_at"] else 0.0
+    return {
+        "jobId": job["id"],
+        "status": job["status"],
+        "total": total,
+        "removed": removed,
+        "failed": failed,
+        "progress": processed / total if total else float(job["status"] == "completed"),
+        "filesPerSecond": processed / elapsed if elapsed > 0 else 0.0,
+        "elapsedSeconds": elapsed,
+        "error": job["error"]
+    }
 
 class AudioCleanup:
     def __init__(self, audio_dir: str = "static/audio"):
         self.audio_dir = Path(audio_dir)
-        self.original_files = set()
-        self.generated_files = set()
         
-        # Register cleanup function
-        atexit.register(self.cleanup_generated_files)
+        # Lock-protected index of generated files: path -> TrackedFile.
+        # Files that are not in the index (e.g. present before startup) are never touched.
+        self._files = {}
+        self._lock = threading.Lock()
+        
+        # Background cleanup jobs live in the shared job queue so every
+        # server worker can report them; the index owner runs them
+        self.batch_size = 1000
+        self.unlink_workers = 4
+        self.owner_id = f"cleanup-{socket.gethostname()}:{os.getpid()}"
+        
+        # Shared log of files generated by worker processes; a worker logs
+        # under its source name instead of keeping an index itself
+        self.manifest = AudioManifest()
+        self._source = None
+        self._share_protection = False
+        
+        # Register cleanup function (exit removes protected files and empty shard directories too)
+        atexit.register(self.cleanup_generated_files, True, True)
         
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
-        
-        # Store original files at startup
-        self.store_original_files()
     
-    def store_original_files(self):
-        """Store list of files that existed at startup"""
-        if self.audio_dir.exists():
-            self.original_files = set(self.audio_dir.glob("*.mp3"))
-            print(f"Stored {len(self.original_files)} original audio files")
+    def _glob(self, stem_pattern: str):
+        """Glob audio files of every engine extension, including hash-sharded subdirectories"""
+        for extension in AUDIO_EXTENSIONS:
+            yield from self.audio_dir.rglob(f"{stem_pattern}.{extension}")
     
     def track_generated_file(self, file_path: str):
         """Track a newly generated audio file"""
-        file_path = Path(file_path)
-        if file_path.exists() and file_path not in self.original_files:
-            self.generated_files.add(file_path)
-            print(f"Tracking generated file: {file_path.name}")
-    
-    def cleanup_generated_files(self):
-        """Remove all generated audio files"""
-        cleaned_count = 0
-        for file_path in self.generated_files:
+        file_path = str(file_path)
+        if self.is_worker:
+            self.manifest.append(self._source, "track", file_path)
+            return
+        with self._lock:
+            entry = self._files.get(file_path)
+            if entry is None:
+                self._files[file_path] = TrackedFile(time.time())
+            else:
+                entry.last_access = time.time()
+        print(f"Tracking generated file: {os.path.basename(file_path)}")
+    
+    def touch_file(self, file_path: str):
+        """
+        Record that a generated file was served again
+        
+        Workers update the file's modification time instead, which the
+        index owner's garbage collector reads as a last access.
+        """
+        if self.is_worker:
             try:
-                if file_path.exists():
-                    file_path.unlink()
-                    cleaned_count += 1
-                    print(f"Cleaned up: {file_path.name}")
-            except Exception as e:
-                print(f"Error cleaning {file_path.name}: {e}")
+                os.utime(file_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            entry = self._files.get(str(file_path))
+            if entry is not None:
+                entry.last_access = time.time()
+    
+    def forget_file(self, file_path: str):
+        """Stop tracking a generated file that has been removed"""
+        with self._lock:
+            self._files.pop(str(file_path), None)
+    
+    def protect_file(self, file_path: str):
+        """Keep a generated file alive across manual cleanups (e.g. while it is cached)"""
+        file_path = str(file_path)
+        if self.is_worker:
+            self.manifest.append(self._source, "protect" if self._share_protection else "track", file_path)
+            return
+        with self._lock:
+            entry = self._files.get(file_path)
+            if entry is None:
+                self._files[file_path] = TrackedFile(time.time(), protected=True)
+            else:
+                entry.protected = True
+    
+    def release_file(self, file_path: str):
+        """Return a protected file to the normal cleanup lifecycle"""
+        if self.is_worker:
+            if self._share_protection:
+                self.manifest.append(self._source, "release", str(file_path))
+            return
+        with self._lock:
+            entry = self._files.get(str(file_path))
+            if entry is not None:
+                entry.protected = False
+    
+    def snapshot(self) -> List[Tuple[str, float, bool]]:
+        """Get a consistent copy of the index as (path, last access, protected)"""
+        with self._lock:
+            return [(path, entry.last_access, entry.is_protected()) for path, entry in self._files.items()]
+    
+    def tracked_count(self) -> int:
+        """Number of tracked generated files"""
+        return len(self._files)
+    
+    def _claim_files(self, include_protected: bool) -> List[str]:
+        """Remove the files to delete from the index and return them"""
+        self.adopt_manifest()
+        with self._lock:
+            doomed = [
+                path for path, entry in self._files.items()
+                if include_protected or not entry.is_protected()
+            ]
+            for path in doomed:
+                del self._files[path]
+        return doomed
+    
+    def _unlink_batch(self, paths: List[str]) -> Tuple[int, int]:
+        """
+        Delete a batch of files, opening each directory once and unlinking
+        relative to its file descriptor
         
-        # Also clean any remaining generated files by pattern
-        if self.audio_dir.exists():
-            pattern_files = list(self.audio_dir.glob("speech_*.mp3"))
-            for file_path in pattern_files:
-                if file_path not in self.original_files:
+        Returns:
+            Tuple of (removed count, failed count)
+        """
+        removed = failed = 0
+        by_directory = defaultdict(list)
+        for path in paths:
+            directory, name = os.path.split(path)
+            by_directory[directory or "."].append(name)
+        
+        use_dir_fd = os.unlink in os.supports_dir_fd
+        for directory, names in by_directory.items():
+            dir_fd = None
+            try:
+                if use_dir_fd:
+                    dir_fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+                for name in names:
                     try:
-                        if file_path.exists():
-                            file_path.unlink()
-                            cleaned_count += 1
-                            print(f"Pattern cleaned: {file_path.name}")
-                    except Exception as e:
-                        print(f"Error pattern cleaning {file_path.name}: {e}")
+                        if dir_fd is not None:
+                            os.unlink(name, dir_fd=dir_fd)
+                        else:
+                            os.unlink(os.path.join(directory, name))
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        failed += 1
+                        print(f"Error cleaning {name}: {e}")
+            except FileNotFoundError:
+                pass
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
+        return removed, failed
+    
+    def _prune_directories(self, directories) -> int:
+        """
+        Remove empty hash-shard directories, walking up towards the audio root
+        
+        Directories that are not empty (or not under the audio root, which is
+        always kept) are left alone.
+        
+        Returns:
+            Number of directories removed
+        """
+        root = os.path.abspath(self.audio_dir)
+        pruned = 0
+        # Deepest first, so a parent is tried after its shards
+        for directory in sorted({os.path.abspath(d) for d in directories}, key=len, reverse=True):
+            while directory.startswith(root + os.sep):
+                try:
+                    os.rmdir(directory)
+                    pruned += 1
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+        return pruned
+    
+    def remove_stale_temp_files(self, max_age: float) -> int:
+        """
+        Remove temporary files left behind by writers that crashed mid-write
+        
+        Writes in progress are never older than a few minutes, so only
+        temporary files last modified more than max_age seconds ago go.
+        
+        Args:
+            max_age: Seconds since last modification after which a temporary file is stale
+            
+        Returns:
+            Number of temporary files removed
+        """
+        if not self.audio_dir.exists():
+            return 0
+        cutoff = time.time() - max_age
+        removed = 0
+        for file_path in self.audio_dir.rglob(".*.tmp"):
+            try:
+                if file_path.stat().st_mtime < cutoff:
+                    file_path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error removing {file_path.name}: {e}")
+        return removed
+    
+    def cleanup_generated_files(self, include_protected: bool = False, prune_directories: bool = False):
+        """
+        Remove all generated audio files
+        
+        Cost is proportional to the number of tracked files; the audio
+        directory itself is never scanned.
+        
+        Args:
+            include_protected: Also remove files protected by the audio cache
+            prune_directories: Also remove shard directories left empty (only
+                safe when nothing is writing audio any more, e.g. on exit)
+        """
+        doomed = self._claim_files(include_protected)
+        removed, failed = self._unlink_batch(doomed)
+        pruned = self._prune_directories(os.path.dirname(path) for path in doomed) if prune_directories else 0
+        print(f"Audio cleanup completed. Removed {removed} files ({failed} failed), {pruned} empty directories.")
+    
+    def start_cleanup_job(self, include_protected: bool = False) -> str:
+        """
+        Queue removal of generated audio files as a background job
+        
+        The job is stored in the shared job queue, so its progress can be
+        read from any server worker. The process that owns the index runs
+        it: right away on a background thread, or within a second in the
+        production master when called from a server worker.
+        
+        Args:
+            include_protected: Also remove files protected by the audio cache
+            
+        Returns:
+            Job id
+        """
+        job_id = job_queue.enqueue("cleanup", {"include_protected": include_protected})
+        if not self.is_worker:
+            threading.Thread(target=self.run_cleanup_jobs, name=f"cleanup-{job_id[:8]}", daemon=True).start()
+        return job_id
+    
+    def run_cleanup_jobs(self) -> int:
+        """
+        Run queued cleanup jobs until none are left (index owner only)
+        
+        Returns:
+            Number of jobs run
+        """
+        if self.is_worker:
+            return 0
+        count = 0
+        while True:
+            job = job_queue.claim(self.owner_id, kind="cleanup")
+            if job is None:
+                return count
+            job_id, _, payload = job
+            self._run_cleanup_job(job_id, payload.get("include_protected", False))
+            count += 1
+    
+    def _run_cleanup_job(self, job_id: str, include_protected: bool):
+        """Delete claimed files batch by batch and record progress"""
+        paths = self._claim_files(include_protected)
+        progress = {"total": len(paths), "removed": 0, "failed": 0}
+        job_queue.update_progress(job_id, progress)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.unlink_workers) as executor:
+                batches = [paths[i:i + self.batch_size] for i in range(0, len(paths), self.batch_size)]
+                for removed, failed in executor.map(self._unlink_batch, batches):
+                    progress["removed"] += removed
+                    progress["failed"] += failed
+                    job_queue.update_progress(job_id, progress)
+            job_queue.complete(job_id, progress)
+            status = "completed"
+        except Exception as e:
+            job_queue.update_progress(job_id, progress)
+            job_queue.fail(job_id, str(e))
+            status = "failed"
+        print(f"Cleanup job {job_id} {status}: removed {progress['removed']}/{progress['total']} files")
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Look up a cleanup job by id and return its status"""
+        job = job_queue.get(job_id)
+        if job is None or job["kind"] != "cleanup":
+            return None
+        return cleanup_job_status(job)
+    
+    @property
+    def is_worker(self) -> bool:
+        """Whether this process logs its files for an index owner instead of keeping them"""
+        return self._source is not None
+    
+    def enter_worker(self, source: str, share_protection: bool = True):
+        """
+        Switch a worker process to logging its files for another process
+        
+        The worker drops the exit cleanup and signal handlers it inherited
+        or registered, and logs every file it generates to the shared
+        manifest instead of indexing it. The process that owns the index
+        (the API server, or the production master) adopts those files, so
+        they are collected and removed on exit even if the worker is gone.
+        Only the index owner runs the garbage collector and cleanup jobs.
+        
+        Args:
+            source: Name of the worker in the manifest
+            share_protection: Also log cache protections; only for workers
+                that serve files and whose exit the owner reports with
+                drop_source
+        """
+        atexit.unregister(self.cleanup_generated_files)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
         
-        print(f"Audio cleanup completed. Removed {cleaned_count} files.")
+        # Forked from a process that may have held the lock
+        self._lock = threading.Lock()
+        self._files = {}
+        self._source = source
+        self._share_protection = share_protection
+    
+    def adopt_manifest(self) -> int:
+        """
+        Apply the events worker processes logged to the shared manifest
+        
+        Does nothing in a worker. Called before every GC sweep and cleanup.
+        
+        Returns:
+            Number of files adopted
+        """
+        if self.is_worker:
+            return 0
+        adopted = 0
+        while True:
+            entries = self.manifest.take()
+            if not entries:
+                return adopted
+            now = time.time()
+            with self._lock:
+                for source, event, file_path in entries:
+                    entry = self._files.get(file_path)
+                    if entry is None:
+                        entry = self._files[file_path] = TrackedFile(now)
+                        adopted += 1
+                    if event == "protect":
+                        entry.holders = (entry.holders or set()) | {source}
+                    elif event == "release" and entry.holders:
+                        entry.holders.discard(source)
+    
+    def drop_source(self, source: str):
+        """Release every protection of a worker that has exited"""
+        self.adopt_manifest()
+        with self._lock:
+            for entry in self._files.values():
+                if entry.holders:
+                    entry.holders.discard(source)
     
     def signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         print(f"\nReceived signal {signum}. Cleaning up audio files...")
-        self.cleanup_generated_files()
+        self.cleanup_generated_files(include_protected=True, prune_directories=True)
         sys.exit(0)
     
     def cleanup_all_audio(self):
-        """Clean all audio files (use with caution)"""
+        """Clean all audio files, leftover temporary files and empty shard directories (use with caution)"""
         if self.audio_dir.exists():
-            audio_files = list(self.audio_dir.glob("*.mp3"))
+            audio_files = list(self._glob("*")) + list(self.audio_dir.rglob(".*.tmp"))
             for file_path in audio_files:
                 try:
                     file_path.unlink()
                     print(f"Removed: {file_path.name}")
                 except Exception as e:
                     print(f"Error removing {file_path.name}: {e}")
-            print(f"Cleaned all {len(audio_files)} audio files")
+            pruned = self._prune_directories(path for path in self.audio_dir.rglob("*") if path.is_dir())
+            print(f"Cleaned all {len(audio_files)} audio files and {pruned} empty directories")
 
 # Global cleanup instance
 cleanup_manager = None
@@ -98,11 +492,38 @@ def track_audio_file(file_path: str):
     if cleanup_manager:
         cleanup_manager.track_generated_file(file_path)
 
+def touch_audio_file(file_path: str):
+    """Record an access to a generated audio file"""
+    if cleanup_manager:
+        cleanup_manager.touch_file(file_path)
+
+def protect_audio_file(file_path: str):
+    """Protect a generated audio file from manual cleanup"""
+    if cleanup_manager:
+        cleanup_manager.protect_file(file_path)
+
+def release_audio_file(file_path: str):
+    """Release a previously protected audio file"""
+    if cleanup_manager:
+        cleanup_manager.release_file(file_path)
+
 def cleanup_now():
     """Manually trigger cleanup"""
     if cleanup_manager:
         cleanup_manager.cleanup_generated_files()
 
+def start_cleanup_job():
+    """Queue cleanup as a background job and return its id"""
+    if cleanup_manager:
+        return cleanup_manager.start_cleanup_job()
+    return None
+
+def get_cleanup_job(job_id: str):
+    """Look up the status of a background cleanup job"""
+    if cleanup_manager:
+        return cleanup_manager.get_job(job_id)
+    return None
+
 def cleanup_all():
     """Clean all audio files"""
     if cleanup_manager:
@@ -0,0 +1,177 @@
+"""
+Job queue utility for TextTale application
+Durable SQLite-backed queue shared by the API and story worker processes
+"""
+
+import os
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+from utils.sqlite_store import SQLiteStore, DATABASE_PATH
+
+
+class JobQueue(SQLiteStore):
+    """
+    Durable job queue stored in the shared SQLite database
+
+    Jobs move from queued to running when a worker claims them and end as
+    completed or failed. Running jobs whose worker stops sending heartbeats
+    are put back in the queue, so a crash or restart never loses work.
+    """
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+    def __init__(self, path: str = DATABASE_PATH, max_attempts: int = 3):
+        """
+        Args:
+            path: SQLite database file
+            max_attempts: Claims per job before a stale job is marked failed
+        """
+        super().__init__(path)
+        self.max_attempts = max_attempts
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Add a job to the queue
+
+        Args:
+            kind: Job type the worker dispatches on, e.g. "story"
+            payload: JSON-serializable job arguments
+
+        Returns:
+            Job id
+        """
+        job_id = uuid.uuid4().hex
+        self._connection().execute(
+            "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, 'queued', ?, ?)",
+            (job_id, kind, json.dumps(payload), time.time())
+        )
+        return job_id
+
+    def claim(self, worker: str, kind: Optional[str] = None) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Take the oldest queued job and mark it running
+
+        Args:
+            worker: Identifier of the claiming worker
+            kind: Only claim jobs of this kind (any kind if None)
+
+        Returns:
+            Tuple of (job id, kind, payload) or None if the queue is empty
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            if kind is None:
+                row = connection.execute(
+                    "SELECT id, kind, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+            else:
+                row = connection.execute(
+                    "SELECT id, kind, payload FROM jobs WHERE status = 'queued' AND kind = ? ORDER BY created_at LIMIT 1",
+                    (kind,)
+                ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (worker, now, now, row["id"])
+            )
+        return row["id"], row["kind"], json.loads(row["payload"])
+
+    def heartbeat(self, job_id: str):
+        """Record that the worker of a running job is still alive"""
+        self._connection().execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+            (time.time(), job_id)
+        )
+
+    def update_progress(self, job_id: str, result: Dict[str, Any]):
+        """Store the partial result of a running job; also counts as a heartbeat"""
+        self._connection().execute(
+            "UPDATE jobs SET result = ?, heartbeat_at = ? WHERE id = ? AND status = 'running'",
+            (json.dumps(result), time.time(), job_id)
+        )
+
+    def complete(self, job_id: str, result: Dict[str, Any]):
+        """Store the result of a finished job"""
+        self._connection().execute(
+            "UPDATE jobs SET status = 'completed', result = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+            (json.dumps(result), time.time(), job_id)
+        )
+
+    def fail(self, job_id: str, error: str):
+        """Mark a job as failed"""
+        self._connection().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+            (error, time.time(), job_id)
+        )
+
+    def requeue_stale(self, timeout: float) -> int:
+        """
+        Recover running jobs whose worker stopped sending heartbeats
+
+        Jobs with attempts left go back to the queue; the rest are failed.
+
+        Args:
+            timeout: Seconds without heartbeat after which a job is stale
+
+        Returns:
+            Number of recovered jobs
+        """
+        cutoff = time.time() - timeout
+        with self._transaction() as connection:
+            requeued = connection.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL "
+                "WHERE status = 'running' AND heartbeat_at < ? AND attempts < ?",
+                (cutoff, self.max_attempts)
+            ).rowcount
+            connection.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Worker stopped responding', finished_at = ? "
+                "WHERE status = 'running' AND heartbeat_at < ?",
+                (time.time(), cutoff)
+            )
+        return requeued
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a job
+
+        Returns:
+            Dictionary with job fields (result decoded) or None if unknown
+        """
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        """Get job counts by status"""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+# Global job queue shared by the API and the story workers
+job_queue = JobQueue(
+    max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+)
@@ -0,0 +1,159 @@
+"""
+Bounded LRU cache utility for TextTale application
+Thread-safe least-recently-used cache with entry, size and age limits
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Thread-safe LRU cache with optional entry count, byte size and age limits"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in the cache
+            max_bytes: Maximum total size of all entries (None for unlimited)
+            max_age: Maximum entry age in seconds (None for no expiry)
+            on_evict: Callback invoked with (key, value) for every evicted entry
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.on_evict = on_evict
+        self._entries = OrderedDict()  # key -> (value, size, created_at)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, marking it as most recently used"""
+        expired = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, created_at = entry
+            if self.max_age is not None and time.time() - created_at > self.max_age:
+                expired = self._remove(key)
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        self._notify([expired])
+        return default
+
+    def put(self, key: Hashable, value: Any, size: int = 0):
+        """Insert or replace a value, evicting old entries to respect the limits"""
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries[key][1]
+            self._entries[key] = (value, size, time.time())
+            self._entries.move_to_end(key)
+            self._total_bytes += size
+            evicted = self._enforce_limits(protect=key)
+        self._notify(evicted)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry without triggering the eviction callback"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._total_bytes -= entry[1]
+            return entry[0]
+
+    def purge_expired(self) -> int:
+        """
+        Evict every entry older than max_age
+
+        Expired entries are otherwise only dropped by get() and put(), so an
+        idle cache would keep them (and whatever they hold) indefinitely.
+
+        Returns:
+            Number of evicted entries
+        """
+        if self.max_age is None:
+            return 0
+        with self._lock:
+            cutoff = time.time() - self.max_age
+            evicted = [
+                self._remove(key)
+                for key, (_, _, created_at) in list(self._entries.items())
+                if created_at < cutoff
+            ]
+        self._notify(evicted)
+        return len(evicted)
+
+    def clear(self):
+        """Evict every entry"""
+        with self._lock:
+            evicted = [self._remove(key) for key in list(self._entries)]
+        self._notify(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _enforce_limits(self, protect: Hashable = None) -> list:
+        """Evict expired entries, then least recently used ones until within limits"""
+        evicted = []
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            for key, (_, _, created_at) in list(self._entries.items()):
+                if created_at < cutoff and key != protect:
+                    evicted.append(self._remove(key))
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == protect:
+                break
+            evicted.append(self._remove(oldest))
+        return evicted
+
+    def _remove(self, key: Hashable):
+        """Remove an entry while holding the lock and return (key, value)"""
+        value, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+        self.evictions += 1
+        return key, value
+
+    def _notify(self, evicted: list):
+        """Run the eviction callback outside the lock"""
+        if not self.on_evict:
+            return
+        for key, value in evicted:
+            try:
+                self.on_evict(key, value)
+            except Exception as e:
+                print(f"Cache eviction callback error: {e}")
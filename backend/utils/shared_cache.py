@@ -0,0 +1,88 @@
+"""
+Shared cache utility for TextTale application
+JSON values in the shared SQLite database, readable from every server worker
+"""
+
+import json
+import time
+from typing import Any, Dict, Hashable, Optional
+from utils.sqlite_store import SQLiteStore, DATABASE_PATH
+
+
+class SharedCache(SQLiteStore):
+    """
+    Cache of JSON-serializable values shared by all processes
+
+    For state that any server worker may have to resolve, such as the
+    lazy-audio stories registered by whichever worker handled the request.
+    Entries expire max_age seconds after they were stored, and the oldest
+    ones are dropped beyond max_entries.
+    """
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS shared_cache_created ON shared_cache (namespace, created_at);
+"""
+
+    def __init__(self, namespace: str, max_entries: int = 10000, max_age: Optional[float] = None, path: str = DATABASE_PATH):
+        """
+        Args:
+            namespace: Name separating this cache from others in the table
+            max_entries: Maximum number of entries kept in the cache
+            max_age: Maximum entry age in seconds (None for no expiry)
+            path: SQLite database file
+        """
+        super().__init__(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the stored value for key, or default if missing or expired"""
+        row = self._connection().execute(
+            "SELECT value, created_at FROM shared_cache WHERE namespace = ? AND key = ?",
+            (self.namespace, str(key))
+        ).fetchone()
+        if row is None or (self.max_age is not None and time.time() - row["created_at"] > self.max_age):
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(row["value"])
+
+    def put(self, key: Hashable, value: Any):
+        """Insert or replace a value, dropping expired and excess entries"""
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO shared_cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, str(key), json.dumps(value), now)
+            )
+            if self.max_age is not None:
+                connection.execute(
+                    "DELETE FROM shared_cache WHERE namespace = ? AND created_at < ?",
+                    (self.namespace, now - self.max_age)
+                )
+            connection.execute(
+                "DELETE FROM shared_cache WHERE namespace = ? AND key IN "
+                "(SELECT key FROM shared_cache WHERE namespace = ? ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries)
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics (hits and misses of this process)"""
+        entries = self._connection().execute(
+            "SELECT COUNT(*) FROM shared_cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
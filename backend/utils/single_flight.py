@@ -0,0 +1,74 @@
+"""
+Single-flight utility for TextTale application
+Collapses concurrent calls for the same key into one shared computation
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Run at most one computation per key at a time and share its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless a call for key is already running,
+        in which case wait for that call and return its result
+
+        Args:
+            key: Identity of the computation
+            fn: Callable to run when no call is in flight
+
+        Returns:
+            Result of the (possibly shared) computation
+        """
+        future, leader = self.join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result
+
+    def join(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Join the computation for key, becoming its leader if none is running
+
+        The leader must call finish() with the same future; everyone else
+        waits on the future.
+
+        Args:
+            key: Identity of the computation
+
+        Returns:
+            Tuple of (shared future, True if the caller is the leader)
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = self._in_flight[key] = Future()
+            return future, True
+
+    def finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        """Publish the leader's result (or error) and let the next call for key run again"""
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def in_flight(self) -> int:
+        """Number of computations currently running"""
+        with self._lock:
+            return len(self._in_flight)
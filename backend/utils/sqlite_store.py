@@ -0,0 +1,57 @@
+"""
+SQLite store utility for TextTale application
+Per-thread connections to the database shared by the API and worker processes
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Database shared by the API, its server workers and the story workers
+DATABASE_PATH = os.getenv("JOB_QUEUE_PATH", "texttale_jobs.db")
+
+
+class SQLiteStore:
+    """
+    Base class for state kept in the shared SQLite database
+
+    Each thread (and process) uses its own connection, and the subclass
+    SCHEMA is created on first use. WAL mode lets one process read while
+    others write.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path: str = DATABASE_PATH):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, creating the schema on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction, rolled back on error"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
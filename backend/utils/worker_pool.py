@@ -0,0 +1,178 @@
+"""
+Shared worker pool utility for TextTale application
+Process-wide bounded thread pool with per-request fair-share scheduling
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class FairWorkerPool:
+    """
+    Bounded thread pool that schedules jobs round-robin across groups
+
+    Every job is submitted under a group (usually one story request). Workers
+    take one job from each group in turn, so a request with 30 scenes cannot
+    starve a request with 6, and the total number of concurrent jobs never
+    exceeds max_workers no matter how many requests are in flight.
+    """
+
+    def __init__(self, max_workers: int = 16, name: str = "pool"):
+        """
+        Args:
+            max_workers: Global limit on concurrently running jobs
+            name: Thread name prefix for the workers
+        """
+        self.max_workers = max_workers
+        self.name = name
+        self._cond = threading.Condition()
+        self._queues: "OrderedDict[Hashable, deque]" = OrderedDict()
+        self._threads = []
+        self._shutdown = False
+
+        # Metrics
+        self._queued = 0
+        self._active = 0
+        self._max_queue_depth = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def submit(self, group: Hashable, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue fn(*args, **kwargs) under a scheduling group
+
+        Args:
+            group: Fair-share group, e.g. the id of the request submitting the job
+            fn: Callable to run on a worker thread
+
+        Returns:
+            Future resolved with the result of fn
+        """
+        future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError(f"{self.name} pool is shut down")
+            queue = self._queues.get(group)
+            if queue is None:
+                queue = self._queues[group] = deque()
+            queue.append((future, fn, args, kwargs, time.perf_counter()))
+            self._queued += 1
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+            self._start_workers()
+            self._cond.notify()
+        return future
+
+    def resize(self, max_workers: int):
+        """
+        Change the concurrency limit before the pool has started
+
+        Lets a forked server worker take its share of a limit that is
+        global across processes.
+
+        Raises:
+            RuntimeError: If worker threads are already running
+        """
+        with self._cond:
+            if self._threads:
+                raise RuntimeError(f"{self.name} pool is already running")
+            self.max_workers = max_workers
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs; workers exit once the queue is drained"""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue-depth and throughput metrics"""
+        with self._cond:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "groups": len(self._queues),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+                "avg_wait_seconds": self._total_wait / finished if finished else 0.0,
+                "avg_run_seconds": self._total_run / finished if finished else 0.0
+            }
+
+    def _start_workers(self):
+        """Start worker threads on first use (called with the lock held)"""
+        if self._threads:
+            return
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self):
+        """Take the next job round-robin across groups (called with the lock held)"""
+        group, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        if queue:
+            self._queues.move_to_end(group)
+        else:
+            del self._queues[group]
+        self._queued -= 1
+        return job
+
+    def _worker(self):
+        """Worker loop"""
+        while True:
+            with self._cond:
+                while not self._queues and not self._shutdown:
+                    self._cond.wait()
+                if not self._queues:
+                    return
+                future, fn, args, kwargs, enqueued_at = self._next_job()
+                self._active += 1
+
+            started_at = time.perf_counter()
+            failed = False
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    failed = True
+                    future.set_exception(e)
+                finished = True
+            else:
+                finished = False
+            run_time = time.perf_counter() - started_at
+
+            with self._cond:
+                self._active -= 1
+                if not finished:
+                    self._cancelled += 1
+                    continue
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+                self._total_wait += started_at - enqueued_at
+                self._total_run += run_time
+
+
+# Global TTS worker pool shared by all audio services
+tts_pool = FairWorkerPool(
+    max_workers=int(os.getenv("TTS_MAX_WORKERS", "16")),
+    name="tts"
+)